@@ -22,7 +22,13 @@
 import sys
 import os
 from datetime import datetime
-from es_client import __version__ as ver
+from importlib.metadata import PackageNotFoundError, version as pkg_version
+
+try:
+    # Read the installed distribution metadata rather than importing the package
+    ver = pkg_version("es_client")
+except PackageNotFoundError:
+    from es_client import __version__ as ver
 
 COPYRIGHT_YEARS = f"2022-{datetime.now().year}"
 
@@ -56,13 +62,8 @@ exclude_patterns = ["_build"]
 
 pygments_style = "sphinx"
 
-on_rtd = os.environ.get("READTHEDOCS", None) == "True"
-
-if not on_rtd:  # only import and set the theme if we're building docs locally
-    import sphinx_rtd_theme
-
-    html_theme = "sphinx_rtd_theme"
-    html_theme_path = [sphinx_rtd_theme.get_html_theme_path()]
+# Sphinx finds installed themes by name; no need to import the theme module
+html_theme = "sphinx_rtd_theme"
 
 intersphinx_mapping = {
     "python": ("https://docs.python.org/3.12", None),
@@ -1,27 +1,149 @@
 """Builder and associated Classes"""
 
+# The __future__ annotations line allows support for Python 3.8 and 3.9 to continue
+from __future__ import annotations
 import typing as t
 import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from functools import lru_cache
 from dotmap import DotMap  # type: ignore
-from elastic_transport import ObjectApiResponse
-import elasticsearch8
 from es_client.helpers.schemacheck import password_filter
 from es_client.defaults import VERSION_MIN, VERSION_MAX, CLIENT_SETTINGS, OTHER_SETTINGS
 from es_client.exceptions import ConfigurationError, ESClientException, NotMaster
 from es_client.helpers.utils import (
     check_config,
     ensure_list,
-    file_exists,
-    get_version,
     get_yaml,
     parse_apikey_token,
-    prune_nones,
+    parse_version,
     verify_ssl_paths,
     verify_url_schema,
 )
 
+if t.TYPE_CHECKING:
+    from elastic_transport import ObjectApiResponse
+    import elasticsearch8
+
 logger = logging.getLogger(__name__)
 
+# Every host must start with http:// or https://
+_URL_SCHEME = re.compile(r"^https?://", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1)
+def _certifi_where() -> str:
+    """
+    :returns: The path to the `certifi <https://github.com/certifi/python-certifi>`_
+        CA bundle
+
+    certifi is only imported, and its bundle located, the first time this is called.
+    """
+    # pylint: disable=import-outside-toplevel
+    import certifi
+
+    return certifi.where()
+
+
+# Clients shared between Builder instances created with reuse_client=True, keyed by
+# their frozen client arguments
+_CLIENT_CACHE: t.Dict[t.Hashable, elasticsearch8.Elasticsearch] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def _freeze(value: t.Any) -> t.Hashable:
+    """
+    :param value: A client argument value
+
+    :returns: A hashable equivalent of `value`, for use as part of a cache key
+
+    Each value is paired with its type, as values which compare equal, such as
+    ``[1]`` and ``(1,)`` or ``1`` and ``True``, do not always pass the same validation.
+    """
+    if isinstance(value, dict):
+        frozen = tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    elif isinstance(value, (list, tuple)):
+        frozen = tuple(_freeze(val) for val in value)
+    else:
+        frozen = value
+    return (type(value).__name__, frozen)
+
+
+# Validated configdicts, keyed by their frozen contents
+_DICT_CACHE: t.Dict[t.Hashable, t.Dict] = {}
+_DICT_CACHE_SIZE = 8
+
+
+def _config_from_dict(configdict: t.Dict) -> t.Dict:
+    """
+    :param configdict: A configuration dictionary
+
+    :returns: The validated configuration from `configdict`
+
+    Repeated Builders from an identical `configdict` skip schema validation. The
+    result is shared between callers and must not be modified in place.
+
+    A copy of `configdict` is validated, as :func:`check_config` fills in missing
+    keys. Validating the caller's dict would change it, and with it the cache key.
+    """
+    try:
+        key = _freeze(configdict)
+        hash(key)
+    except TypeError:
+        # Something in there is unhashable, so it cannot be cached
+        return check_config(deepcopy(configdict))
+    if key not in _DICT_CACHE:
+        if len(_DICT_CACHE) >= _DICT_CACHE_SIZE:
+            # Evict the oldest entry
+            del _DICT_CACHE[next(iter(_DICT_CACHE))]
+        _DICT_CACHE[key] = check_config(deepcopy(configdict))
+    return _DICT_CACHE[key]
+
+
+# pylint: disable=unused-argument
+@lru_cache(maxsize=8)
+def _load_validated(path: str, mtime_ns: int, env_hash: int) -> t.Dict:
+    """
+    :param path: The absolute path to a YAML configuration file
+    :param mtime_ns: The modification time of `path` in nanoseconds
+    :param env_hash: A hash of the current environment variables
+
+    :returns: The validated configuration from `path`
+
+    `mtime_ns` and `env_hash` are only part of the cache key. A changed file, or a
+    changed environment variable referenced as ``${VAR}`` in the file, will force a
+    re-read.
+    """
+    return check_config(get_yaml(path))
+
+
+def _config_from_file(path: str) -> t.Dict:
+    """
+    :param path: The path to a YAML configuration file
+
+    :returns: The validated configuration from `path`
+
+    Repeated reads of an unchanged file skip YAML parsing and schema validation. The
+    result is shared between callers and must not be modified in place.
+
+    The cache only lives as long as the process. Persisting it to disk is deliberately
+    avoided: the validated result can hold credentials expanded from environment
+    variables, and unpickling a file that sits next to a config file would execute
+    whatever it contains.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        # Let get_yaml raise the usual ConfigurationError
+        return check_config(get_yaml(path))
+    env_hash = hash(frozenset(os.environ.items()))
+    return _load_validated(os.path.abspath(path), mtime_ns, env_hash)
+
+
 # pylint: disable=R0902
 
 
@@ -30,12 +152,18 @@ class Builder:
     :param configdict: A configuration dictionary
     :param configfile: A YAML configuration file
     :param autoconnect: Connect to client automatically
+    :param reuse_client: Share one client between all Builder instances with identical
+        ``client`` settings
 
     Build a client connection object out of settings from `configfile` or `configdict`.
 
     If neither `configfile` nor `configdict` is provided, empty defaults will be used.
 
     If both are provided, `configdict` will be used, and `configfile` ignored.
+
+    With `reuse_client`, the connection pool (and any TLS sessions) of an earlier
+    client is reused. Shared clients must not be closed directly. Use
+    :py:meth:`close_cached_clients` instead.
     """
 
     def __init__(
@@ -43,13 +171,18 @@ class Builder:
         configdict: t.Union[t.Dict, None] = None,
         configfile: t.Union[str, None] = None,
         autoconnect: bool = False,
+        reuse_client: bool = False,
     ):
         #: The DotMap storage for attributes and settings
         self.attributes = DotMap()
         self.set_client_defaults()
         self.set_other_defaults()
-        #: The :py:class:`~.elasticsearch.Elasticsearch` client connection object
-        self.client = elasticsearch8.Elasticsearch(hosts="http://127.0.0.1:9200")
+        #: The :py:class:`~.elasticsearch.Elasticsearch` client connection object.
+        #: This is ``None`` until :py:meth:`connect` is called.
+        self.client: t.Union[elasticsearch8.Elasticsearch, None] = None
+        self._info: t.Union[ObjectApiResponse[t.Any], None] = None
+        self._info_time = 0.0
+        self._reuse_client = reuse_client
         self.process_config_opts(configdict, configfile)
         self.version_max = VERSION_MAX
         self.version_min = VERSION_MIN
@@ -59,6 +192,37 @@ class Builder:
             self.connect()
             self.test_connection()
 
+    @classmethod
+    def build_many(
+        cls,
+        configdicts: t.Sequence[t.Dict],
+        autoconnect: bool = True,
+        reuse_client: bool = False,
+    ) -> t.List[Builder]:
+        """
+        :param configdicts: A sequence of configuration dictionaries
+        :param autoconnect: Connect every Builder before returning
+        :param reuse_client: Opt in to sharing clients between Builders with identical
+            ``client`` settings. Off by default, as closing or reconfiguring a shared
+            client affects every Builder using it.
+
+        :returns: One Builder per entry in `configdicts`, in the same order
+
+        Build several Builders at once. Configuration validation is cached, so each
+        distinct configuration is only validated once. With `autoconnect`, the
+        connections and their post-connection checks run concurrently.
+        """
+        builders = [
+            cls(configdict=configdict, reuse_client=reuse_client)
+            for configdict in configdicts
+        ]
+        if autoconnect and builders:
+            with ThreadPoolExecutor(max_workers=min(len(builders), 8)) as executor:
+                futures = [executor.submit(builder.connect) for builder in builders]
+                for future in futures:
+                    future.result()
+        return builders
+
     @property
     def master_only(self) -> bool:
         """Only allow connection to the elected master, if ``True``
@@ -77,7 +241,8 @@ class Builder:
     def is_master(self) -> bool:
         """Is the node we connected to the elected master?
 
-        :getter: Get the "Are we the elected master?" state
+        :getter: Get the "Are we the elected master?" state. This is ``None`` until it
+            is looked up, e.g. with :py:meth:`check_is_master`
         :setter: Set the "Are we the elected master?" state
         :type: bool
         """
@@ -171,15 +336,11 @@ class Builder:
 
     def set_client_defaults(self) -> None:
         """Set defaults for the client_args property"""
-        self.client_args = DotMap()
-        for key in CLIENT_SETTINGS:
-            self.client_args[key] = None
+        self.client_args = DotMap(dict.fromkeys(CLIENT_SETTINGS))
 
     def set_other_defaults(self) -> None:
         """Set defaults for the other_args property"""
-        self.other_args = DotMap()
-        for key in OTHER_SETTINGS:
-            self.other_args[key] = None
+        self.other_args = DotMap(dict.fromkeys(OTHER_SETTINGS))
 
     def process_config_opts(
         self, configdict: t.Union[t.Dict, None], configfile: t.Union[str, None]
@@ -187,16 +348,17 @@ class Builder:
         """Process whether to use a configdict or configfile"""
         if configfile:
             logger.debug("Using values from configfile: %s", configfile)
-            self.config = check_config(get_yaml(configfile))
+            self.config = _config_from_file(configfile)
         if configdict:
-            logger.debug("Using configdict values: %s", password_filter(configdict))
-            self.config = check_config(configdict)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Using configdict values: %s", password_filter(configdict))
+            self.config = _config_from_dict(configdict)
         if not configfile and not configdict:
             # Empty/Default config.
             logger.debug(
                 "No configuration file or dictionary provided. Using defaults."
             )
-            self.config = check_config({"client": {}, "other_settings": {}})
+            self.config = _config_from_dict({"client": {}, "other_settings": {}})
 
     def update_config(self) -> None:
         """Update object with values provided"""
@@ -204,26 +366,31 @@ class Builder:
         self.other_args.update(self.config.other_settings)
         self.master_only = self.other_args.master_only
         self.is_master = None  # Preset, until we populate this later
-        if "skip_version_test" in self.other_args:
-            self.skip_version_test = self.other_args.skip_version_test
-        else:
-            self.skip_version_test = False
+        self.skip_version_test = self.other_args.get("skip_version_test", False)
 
     def validate(self) -> None:
         """Validate that what has been supplied is acceptable to attempt a connection"""
         # Configuration pre-checks
-        if self.client_args.hosts is not None:
-            verified_hosts = []
-            self.client_args.hosts = ensure_list(self.client_args.hosts)
-            for host in self.client_args.hosts:
-                try:
-                    verified_hosts.append(verify_url_schema(host))
-                except ConfigurationError as exc:
-                    logger.critical("Invalid host schema detected: %s -- %s", host, exc)
-                    raise ConfigurationError(
-                        f"Invalid host schema detected: {host}"
-                    ) from exc
-            self.client_args.hosts = verified_hosts
+        hosts = self.client_args.get("hosts")
+        if hosts is not None:
+            # One pass for a cheap scheme test, so obviously bad hosts are all reported
+            # at once, which also drops repeated hosts while preserving their order
+            unique: t.Dict[str, None] = {}
+            invalid = []
+            for host in ensure_list(hosts):
+                if isinstance(host, str) and _URL_SCHEME.match(host):
+                    unique[host] = None
+                else:
+                    invalid.append(host)
+            if invalid:
+                logger.critical("Invalid host schema detected: %s", invalid)
+                raise ConfigurationError(f"Invalid host schema detected: {invalid}")
+            try:
+                self.client_args.hosts = [verify_url_schema(host) for host in unique]
+            except ConfigurationError as exc:
+                msg = f"Invalid host schema detected: {exc}"
+                logger.critical(msg)
+                raise ConfigurationError(msg) from exc
         self._check_basic_auth()
         self._check_api_key()
         self._check_cloud_id()
@@ -233,22 +400,60 @@ class Builder:
         """Attempt connection and do post-connection checks"""
         # Get the client
         self._get_client()
+        # Reject a master_only misconfiguration before sending any requests
+        self._check_master_hosts()
+        # The info() and master lookups are independent, so when both are needed,
+        # overlap their round-trips. The post checks below use the cached results, or
+        # make a single lookup themselves.
+        if (
+            not self.skip_version_test
+            and self.master_only
+            and self.attributes.is_master is None
+        ):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                info = executor.submit(self._cluster_info)
+                self._find_master(executor)
+                info.result()
         # Post checks
         self._check_version()
         self._check_master()
 
+    def check_is_master(self) -> bool:
+        """
+        :returns: Whether the node :py:attr:`client` is connected to is the elected
+            master. If this is not yet known, it is looked up first.
+        """
+        if self.attributes.is_master is None:
+            self._find_master()
+        return self.attributes.is_master
+
+    def warm_up(self, connections: int = 4) -> None:
+        """
+        :param connections: How many connections to open
+
+        Open up to `connections` pooled HTTP connections by sending that many
+        concurrent :meth:`Elasticsearch.ping() <elasticsearch8.Elasticsearch.ping>`
+        requests. Subsequent concurrent requests then don't each wait on a new TCP
+        (and TLS) handshake.
+
+        Only useful for callers which go on to send concurrent requests. Call after
+        :py:meth:`connect`.
+        """
+        if connections < 1:
+            return
+        with ThreadPoolExecutor(max_workers=max(1, connections)) as executor:
+            list(executor.map(lambda _: self.client.ping(), range(connections)))
+
     def _check_basic_auth(self) -> None:
         """Create ``basic_auth`` tuple from username and password"""
-        if "username" in self.other_args or "password" in self.other_args:
-            usr = self.other_args.username if "username" in self.other_args else None
-            pwd = self.other_args.password if "password" in self.other_args else None
-            if usr is None and pwd is None:
-                pass
-            elif usr is None or pwd is None:
-                msg = "Must populate both username and password, or leave both empty"
-                raise ConfigurationError(msg)
-            else:
-                self.client_args.basic_auth = (usr, pwd)
+        usr = self.other_args.get("username")
+        pwd = self.other_args.get("password")
+        if usr is None and pwd is None:
+            return
+        if usr is None or pwd is None:
+            msg = "Must populate both username and password, or leave both empty"
+            raise ConfigurationError(msg)
+        self.client_args.basic_auth = (usr, pwd)
 
     def _check_api_key(self) -> None:
         """
@@ -258,117 +463,126 @@ class Builder:
         Or if ``api_key`` subkey ``token`` is present, derive ``id`` and ``api_key``
         from ``token``
         """
-        if "api_key" in self.other_args:
-            # If present, token will override any value in 'id' or 'api_key'
-            # pylint: disable=no-member
-            if "token" in self.other_args.api_key:
-                if self.other_args.api_key.token is not None:
-                    (self.other_args.api_key.id, self.other_args.api_key.api_key) = (
-                        parse_apikey_token(self.other_args.api_key.token)
-                    )
-            if "id" in self.other_args.api_key or "api_key" in self.other_args.api_key:
-                api_id = (
-                    self.other_args.api_key.id
-                    if "id" in self.other_args.api_key
-                    else None
-                )
-                api_key = (
-                    self.other_args.api_key.api_key
-                    if "api_key" in self.other_args.api_key
-                    else None
-                )
-                if api_id is None and api_key is None:
-                    self.client_args.api_key = (
-                        None  # Setting this here because of DotMap
-                    )
-                elif api_id is None or api_key is None:
-                    msg = "Must populate both id and api_key, or leave both empty"
-                    raise ConfigurationError(msg)
-                else:
-                    self.client_args.api_key = (api_id, api_key)
+        apikey = self.other_args.get("api_key")
+        if not apikey:
+            return
+        # If present, token will override any value in 'id' or 'api_key'
+        token = apikey.get("token")
+        if token is not None:
+            apikey.id, apikey.api_key = parse_apikey_token(token)
+        if "id" not in apikey and "api_key" not in apikey:
+            return
+        api_id = apikey.get("id")
+        api_key = apikey.get("api_key")
+        if api_id is None and api_key is None:
+            self.client_args.api_key = None  # Setting this here because of DotMap
+        elif api_id is None or api_key is None:
+            msg = "Must populate both id and api_key, or leave both empty"
+            raise ConfigurationError(msg)
+        else:
+            self.client_args.api_key = (api_id, api_key)
 
     def _check_cloud_id(self) -> None:
         """Remove ``hosts`` key if ``cloud_id`` provided"""
-        if "cloud_id" in self.client_args and self.client_args.cloud_id is not None:
-            # We can remove the default if that's all there is
-            if (
-                self.client_args.hosts == ["http://127.0.0.1:9200"]
-                and len(self.client_args.hosts) == 1
-            ):
-                self.client_args.hosts = None
-            if self.client_args.hosts is not None:
-                raise ConfigurationError('Cannot populate both "hosts" and "cloud_id"')
+        client_args = self.client_args
+        if client_args.get("cloud_id") is None:
+            return
+        hosts = client_args.get("hosts")
+        # We can remove the default if that's all there is
+        if hosts == ["http://127.0.0.1:9200"]:
+            client_args.hosts = None
+        elif hosts is not None:
+            raise ConfigurationError('Cannot populate both "hosts" and "cloud_id"')
 
     def _check_ssl(self) -> None:
         """
         Use `certifi <https://github.com/certifi/python-certifi>`_ if using ssl
         and ``ca_certs`` has not been specified.
         """
-        verify_ssl_paths(self.client_args)
-        if "cloud_id" in self.client_args and self.client_args.cloud_id is not None:
+        # Raises ConfigurationError if ca_certs, client_cert or client_key is set but
+        # cannot be read, so there is no need to test those paths again below
+        client_args = self.client_args
+        verify_ssl_paths(client_args)
+        if client_args.get("ca_certs"):
+            # Nothing to fill in, so skip working out the scheme
+            return
+        hosts = client_args.get("hosts")
+        if client_args.get("cloud_id") is not None:
             scheme = "https"
-        elif self.client_args.hosts is None:
+        elif hosts is None:
             scheme = None
         else:
-            scheme = self.client_args.hosts[0].split(":")[0].lower()
+            # Only the text before the first colon is needed
+            scheme = hosts[0].partition(":")[0].lower()
         if scheme == "https":
-            if "ca_certs" not in self.client_args or not self.client_args.ca_certs:
-                # pylint: disable=import-outside-toplevel
-                import certifi
-
-                # Use certifi certificates via certifi.where():
-                self.client_args.ca_certs = certifi.where()
-            else:
-                keylist = ["ca_certs", "client_cert", "client_key"]
-                for key in keylist:
-                    if key in self.client_args and self.client_args[key]:
-                        if not file_exists(self.client_args[key]):
-                            msg = f'"{key}: {self.client_args[key]}" File not found!'
-                            logger.critical(msg)
-                            raise ConfigurationError(msg)
-
-    def _find_master(self) -> None:
-        """Find out if we are connected to the elected master node"""
-        my_node_id = list(self.client.nodes.info(node_id="_local")["nodes"])[0]
-        master_node_id = self.client.cluster.state(metric="master_node")["master_node"]
-        self.is_master = my_node_id == master_node_id
+            # Use certifi certificates via certifi.where():
+            client_args.ca_certs = _certifi_where()
+
+    def _find_master(self, executor: t.Union[ThreadPoolExecutor, None] = None) -> None:
+        """
+        :param executor: If provided, the local node lookup is run on it, so that it is
+            in flight at the same time as the elected master lookup
+
+        Find out if we are connected to the elected master node
+        """
+        # filter_path trims the responses server-side: only the node id keys and the
+        # master_node value are needed, not the full node info payload. The cluster
+        # state lists every node, so the local node id needs its own request.
+        kwargs = {"node_id": "_local", "filter_path": "nodes.*.name"}
+        local = executor.submit(self.client.nodes.info, **kwargs) if executor else None
+        master_node_id = self.client.cluster.state(
+            metric="master_node", filter_path="master_node"
+        )["master_node"]
+        nodes = local.result() if local else self.client.nodes.info(**kwargs)
+        self.is_master = next(iter(nodes["nodes"])) == master_node_id
 
     def _check_master(self) -> None:
         """
         If :py:attr:`master_only` is ``True`` and we are not connected to the elected
         master node, raise :py:exc:`~es_client.exceptions.NotMaster`
         """
-        if self.is_master is None:
-            self._find_master()
-        if self.master_only:
-            msg = (
-                "The master_only flag is set to True, but the client is  "
-                "currently connected to a non-master node."
+        if not self.master_only:
+            # is_master is only looked up if check_is_master is called
+            return
+        msg = (
+            "The master_only flag is set to True, but the client is  "
+            "currently connected to a non-master node."
+        )
+        self._check_master_hosts()
+        if isinstance(self.client_args.get("hosts"), list):
+            if not self.check_is_master():
+                logger.info(msg)
+                raise NotMaster(msg)
+
+    def _check_master_hosts(self) -> None:
+        """
+        If :py:attr:`master_only` is ``True`` and more than one host is configured,
+        raise :py:exc:`~es_client.exceptions.ConfigurationError`
+        """
+        hosts = self.client_args.get("hosts")
+        if self.master_only and isinstance(hosts, list) and len(hosts) > 1:
+            raise ConfigurationError(
+                f'"master_only" cannot be True if more than one host is '
+                f"specified. Hosts = {hosts}"
             )
-            if "hosts" in self.client_args and isinstance(self.client_args.hosts, list):
-                if len(self.client_args.hosts) > 1:
-                    raise ConfigurationError(
-                        f'"master_only" cannot be True if more than one host is '
-                        f"specified. Hosts = {self.client_args.hosts}"
-                    )
-                if not self.is_master:
-                    logger.info(msg)
-                    raise NotMaster(msg)
 
     def _check_version(self) -> None:
         """
         Compare the Elasticsearch cluster version to :py:attr:`min_version` and
         :py:attr:`max_version`
         """
-        v = get_version(self.client)
         if self.skip_version_test:
+            # Don't spend a round-trip fetching a version we will not check
             logger.warning("Skipping Elasticsearch version checks")
-        else:
-            logger.debug("Detected version %s", ".".join(map(str, v)))
-            if v >= self.version_max or v < self.version_min:
-                msg = f"Elasticsearch version {'.'.join(map(str, v))} not supported"
-                logger.error(msg)
-                raise ESClientException(msg)
+            return
+        v = parse_version(self._cluster_info()["version"]["number"])
+        # parse_version always returns (major, minor, patch), and logging only formats
+        # the message if it will actually be emitted
+        logger.debug("Detected version %s.%s.%s", *v)
+        if v >= self.version_max or v < self.version_min:
+            msg = f"Elasticsearch version {v[0]}.{v[1]}.{v[2]} not supported"
+            logger.error(msg)
+            raise ESClientException(msg)
 
     def _get_client(self) -> None:
         """
@@ -376,13 +590,61 @@ class Builder:
         :py:class:`~.elasticsearch.Elasticsearch` object and populate
         :py:attr:`client`
         """
-        # Eliminate any remaining "None" entries from the client arguments
-        client_args = prune_nones(self.client_args.toDict())
-        self.client = elasticsearch8.Elasticsearch(**client_args)
+        # Deferred so that importing this module (e.g. for CLI --help) does not pull
+        # in the entire elasticsearch8/elastic_transport stack
+        # pylint: disable=import-outside-toplevel
+        import elasticsearch8
+
+        # Eliminate any remaining "None" entries from the client arguments while
+        # converting to plain dicts, in a single pass over the top-level keys. This is
+        # prune_nones(self.client_args.toDict()) without the intermediate dict.
+        client_args = {
+            key: value.toDict() if isinstance(value, DotMap) else value
+            for key, value in self.client_args.items()
+            if value is not None and value != "None"
+        }
+        if self._reuse_client:
+            key = _freeze(client_args)
+            with _CLIENT_CACHE_LOCK:
+                if key not in _CLIENT_CACHE:
+                    _CLIENT_CACHE[key] = elasticsearch8.Elasticsearch(**client_args)
+                self.client = _CLIENT_CACHE[key]
+        else:
+            self.client = elasticsearch8.Elasticsearch(**client_args)
+        self._info = None
+
+    @staticmethod
+    def close_cached_clients() -> None:
+        """Close and forget every client shared via ``reuse_client=True``"""
+        with _CLIENT_CACHE_LOCK:
+            while _CLIENT_CACHE:
+                _, client = _CLIENT_CACHE.popitem()
+                client.close()
+
+    def _cluster_info(
+        self, max_age: t.Union[float, None] = None
+    ) -> ObjectApiResponse[t.Any]:
+        """
+        :param max_age: Fetch a new response if the cached one is older than this many
+            seconds. If ``None``, any cached response is used.
+
+        :returns: The :meth:`Elasticsearch.info() <elasticsearch8.Elasticsearch.info>`
+            response for :py:attr:`client`
+        """
+        now = time.monotonic()
+        if self._info is None or (
+            max_age is not None and now - self._info_time > max_age
+        ):
+            self._info = self.client.info()
+            self._info_time = now
+        return self._info
 
     def test_connection(self) -> ObjectApiResponse[t.Any]:
         """
         Connect and execute :meth:`Elasticsearch.info()
         <elasticsearch8.Elasticsearch.info>`
+
+        A response fetched within the last second, e.g. for the version check in
+        :py:meth:`connect`, is reused rather than costing a second round-trip.
         """
-        return self.client.info()
+        return self._cluster_info(max_age=1.0)
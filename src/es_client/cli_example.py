@@ -3,13 +3,8 @@ Sample CLI script that will get a client using both config file and CLI args/opt
 """
 
 import click
-from elasticsearch8.exceptions import BadRequestError, NotFoundError
 from es_client.helpers import config as cfg
 from es_client.defaults import OPTION_DEFAULTS, SHOW_EVERYTHING
-from es_client.helpers.logging import configure_logging
-
-# Since this file will not be imported, we use this to squash the F401 error
-__all__ = ["BadRequestError", "NotFoundError"]
 
 # pylint: disable=E1120
 
@@ -58,7 +53,17 @@ __all__ = ["BadRequestError", "NotFoundError"]
 # pylint: disable=R0913,R0914,W0613,W0622
 
 
-@click.group(context_settings=cfg.context_settings())
+@click.group(
+    cls=cfg.LazyGroup,
+    lazy_subcommands={
+        "show-all-options": (
+            "es_client.cli_example",
+            "_show_all_options",
+            "Show all configuration options",
+        )
+    },
+    context_settings=cfg.context_settings(),
+)
 @cfg.options_from_dict(OPTION_DEFAULTS)
 @click.version_option(None, "-v", "--version", prog_name="cli_example")
 @click.pass_context
@@ -116,6 +121,11 @@ def run(
 
     # Configure logging. This will use the values from command line parameters, or
     # what's now been stored in ctx.obj['draftcfg']
+    # Imported here so --help output never has to load the logging handlers and
+    # formatters (including ecs_logging)
+    # pylint: disable=import-outside-toplevel
+    from es_client.helpers.logging import configure_logging
+
     configure_logging(ctx)
 
     # The ``cfg.generate_configdict`` function does all of the overriding of YAML
@@ -176,48 +186,60 @@ def run(
 # root-level and not a sub-level command.
 
 
-@run.command(
-    context_settings=cfg.context_settings(), short_help="Show all configuration options"
-)
-@cfg.options_from_dict(SHOW_EVERYTHING)
-@click.version_option(None, "-v", "--version", prog_name="cli_example")
-@click.pass_context
-def show_all_options(
-    ctx,
-    config,
-    hosts,
-    cloud_id,
-    api_token,
-    id,
-    api_key,
-    username,
-    password,
-    bearer_auth,
-    opaque_id,
-    request_timeout,
-    http_compress,
-    verify_certs,
-    ca_certs,
-    client_cert,
-    client_key,
-    ssl_assert_hostname,
-    ssl_assert_fingerprint,
-    ssl_version,
-    master_only,
-    skip_version_test,
-    loglevel,
-    logfile,
-    logformat,
-    blacklist,
-):
+def _show_all_options() -> click.Command:
     """
-    ALL OPTIONS SHOWN
-
-    The full list of options available for configuring a connection at the command-line.
+    Build the ``show-all-options`` command.
+    :py:class:`~.es_client.helpers.config.LazyGroup` only calls this when the command
+    is requested, so its long option list is not built for every invocation of ``run``.
     """
-    ctx = click.get_current_context()
-    click.echo(ctx.get_help())
-    ctx.exit()
+
+    @click.command(
+        "show-all-options",
+        context_settings=cfg.context_settings(),
+        short_help="Show all configuration options",
+    )
+    @cfg.options_from_dict(SHOW_EVERYTHING)
+    @click.version_option(None, "-v", "--version", prog_name="cli_example")
+    @click.pass_context
+    def show_all_options(
+        ctx,
+        config,
+        hosts,
+        cloud_id,
+        api_token,
+        id,
+        api_key,
+        username,
+        password,
+        bearer_auth,
+        opaque_id,
+        request_timeout,
+        http_compress,
+        verify_certs,
+        ca_certs,
+        client_cert,
+        client_key,
+        ssl_assert_hostname,
+        ssl_assert_fingerprint,
+        ssl_version,
+        master_only,
+        skip_version_test,
+        loglevel,
+        logfile,
+        logformat,
+        blacklist,
+    ):
+        """
+        ALL OPTIONS SHOWN
+
+        The full list of options available for configuring a connection at the
+        command-line.
+        """
+        ctx = click.get_current_context()
+        click.echo(ctx.get_help())
+        ctx.exit()
+
+    return show_all_options
 
 
 #
@@ -3,6 +3,8 @@
 # pylint: disable=line-too-long
 import typing as t
 from copy import deepcopy
+from functools import lru_cache
+from types import MappingProxyType
 from click import Choice, Path
 from voluptuous import All, Any, Boolean, Coerce, Optional, Range, Schema
 
@@ -25,7 +27,7 @@ When doing configuration Schema validation, redact the value from any listed dic
 key. This only happens if logging is at DEBUG level.
 """
 
-CLIENT_SETTINGS: t.Sequence[str] = [
+CLIENT_SETTINGS: t.Tuple[str, ...] = (
     "hosts",
     "cloud_id",
     "api_key",
@@ -67,19 +69,19 @@ CLIENT_SETTINGS: t.Sequence[str] = [
     "meta_header",
     "host_info_callback",
     "_transport",
-]
+)
 """
 Valid argument/option names for :py:class:`~.elasticsearch8.Elasticsearch`. Too large
 to show
 """
 
-OTHER_SETTINGS: t.Sequence[str] = [
+OTHER_SETTINGS: t.Tuple[str, ...] = (
     "master_only",
     "skip_version_test",
     "username",
     "password",
     "api_key",
-]
+)
 """Valid option names for :py:class:`~.es_client.builder.Builder`'s other settings"""
 
 CLICK_SETTINGS: t.Dict[str, t.Dict] = {
@@ -184,11 +186,12 @@ LOGGING_SETTINGS: t.Dict[str, t.Dict] = {
 Default logging settings used for building :py:class:`click.Option`. Too large to show.
 """
 
-SHOW_OPTION: t.Dict[str, bool] = {"hidden": False}
-"""Override value to "unhide" a :py:class:`click.Option`"""
+SHOW_OPTION: t.Mapping[str, bool] = MappingProxyType({"hidden": False})
+"""Override value to "unhide" a :py:class:`click.Option` (read-only)"""
 
-SHOW_ENVVAR: t.Dict[str, bool] = {"show_envvar": True}
+SHOW_ENVVAR: t.Mapping[str, bool] = MappingProxyType({"show_envvar": True})
 """Override value to make Click's help output show the associated environment variable
+(read-only)
 """
 
 OVERRIDE: t.Dict = {**SHOW_OPTION, **SHOW_ENVVAR}
@@ -243,6 +246,7 @@ SHOW_EVERYTHING: t.Dict[str, t.Dict] = all_on()
 
 
 # Logging schema
+@lru_cache(maxsize=1)
 def config_logging() -> Schema:
     """
     :returns: A validation schema of all acceptable logging configuration parameter
@@ -284,6 +288,7 @@ def config_logging() -> Schema:
 
 
 # All elasticsearch client options, with a few additional arguments.
+@lru_cache(maxsize=1)
 def config_schema() -> Schema:
     """
     :returns: A validation schema of all acceptable client configuration parameter
@@ -294,41 +299,44 @@ def config_schema() -> Schema:
     object with defaults
     """
     # pylint: disable=no-value-for-parameter
+    # Validators used by many keys are built once and shared
+    boolean = Boolean()
+    none_or_str = Any(None, str)
     return Schema(
         {
             Optional("other_settings", default={}): {
-                Optional("master_only", default=False): Boolean(),
-                Optional("skip_version_test", default=False): Boolean(),
-                Optional("username", default=None): Any(None, str),
-                Optional("password", default=None): Any(None, str),
+                Optional("master_only", default=False): boolean,
+                Optional("skip_version_test", default=False): boolean,
+                Optional("username", default=None): none_or_str,
+                Optional("password", default=None): none_or_str,
                 Optional("api_key", default={}): {
-                    Optional("id"): Any(None, str),
-                    Optional("api_key"): Any(None, str),
-                    Optional("token"): Any(None, str),
+                    Optional("id"): none_or_str,
+                    Optional("api_key"): none_or_str,
+                    Optional("token"): none_or_str,
                 },
             },
             Optional("client", default={}): {
                 Optional("hosts", default=None): Any(None, list, str),
-                Optional("cloud_id", default=None): Any(None, str),
+                Optional("cloud_id", default=None): none_or_str,
                 Optional("api_key"): Any(None, tuple),
                 Optional("basic_auth"): Any(None, tuple),
-                Optional("bearer_auth"): Any(None, str),
-                Optional("opaque_id"): Any(None, str),
+                Optional("bearer_auth"): none_or_str,
+                Optional("opaque_id"): none_or_str,
                 Optional("headers"): Any(None, dict),
                 Optional("connections_per_node"): Any(
                     None, All(Coerce(int), Range(min=1, max=100))
                 ),
-                Optional("http_compress"): Boolean(),
-                Optional("verify_certs"): Boolean(),
-                Optional("ca_certs"): Any(None, str),
-                Optional("client_cert"): Any(None, str),
-                Optional("client_key"): Any(None, str),
+                Optional("http_compress"): boolean,
+                Optional("verify_certs"): boolean,
+                Optional("ca_certs"): none_or_str,
+                Optional("client_cert"): none_or_str,
+                Optional("client_key"): none_or_str,
                 #: Hostname or IP address to verify on the node's certificate.
                 #: This is useful if the certificate contains a different value
                 #: than the one supplied in ``host``. An example of this situation
                 #: is connecting to an IP address instead of a hostname.
                 #: Set to ``False`` to disable certificate hostname verification.
-                Optional("ssl_assert_hostname"): Any(None, str),
+                Optional("ssl_assert_hostname"): none_or_str,
                 #: SHA-256 fingerprint of the node's certificate. If this value is
                 #: given then root-of-trust verification isn't done and only the
                 #: node's certificate fingerprint is verified.
@@ -337,29 +345,28 @@ def config_schema() -> Schema:
                 #: chain including the Root CA matches this fingerprint. However
                 #: because this requires using private APIs support for this is
                 #: **experimental**.
-                Optional("ssl_assert_fingerprint"): Any(None, str),
-                Optional("ssl_version"): Any(
-                    None, str
-                ),  # Minimum acceptable TLS/SSL version
+                Optional("ssl_assert_fingerprint"): none_or_str,
+                # Minimum acceptable TLS/SSL version
+                Optional("ssl_version"): none_or_str,
                 #: Pre-configured :class:`ssl.SSLContext` OBJECT. If this value
                 #: is given then no other TLS options (besides
                 #: ``ssl_assert_fingerprint``) can be set on the
                 #: :class:`elastic_transport.NodeConfig`.
-                Optional("ssl_context"): Any(None, str),
+                Optional("ssl_context"): none_or_str,
                 # Keeping this here in case someone APIs it, but otherwise it's not
                 # likely to be used.
-                Optional("ssl_show_warn"): Boolean(),
-                Optional("transport_class"): Any(None, str),
+                Optional("ssl_show_warn"): boolean,
+                Optional("transport_class"): none_or_str,
                 Optional("request_timeout"): Any(
                     None, All(Coerce(float), Range(min=0.1, max=86400.0))
                 ),
                 # node_class: Union[str, Type[BaseNode]] = Urllib3HttpNode,
-                Optional("node_class"): Any(None, str),
+                Optional("node_class"): none_or_str,
                 # node_pool_class: Type[NodePool] = NodePool,
-                Optional("node_pool_class"): Any(None, str),
-                Optional("randomize_nodes_in_pool"): Boolean(),
+                Optional("node_pool_class"): none_or_str,
+                Optional("randomize_nodes_in_pool"): boolean,
                 # node_selector_class: Optional[Union[str, Type[NodeSelector]]] = None,
-                Optional("node_selector_class"): Any(None, str),
+                Optional("node_selector_class"): none_or_str,
                 Optional("dead_node_backoff_factor"): Any(None, float),
                 Optional("max_dead_node_backoff"): Any(None, float),
                 # One of:
@@ -370,7 +377,7 @@ def config_schema() -> Schema:
                 # "CompatibilityModeJsonSerializer"
                 # "CompatibilityModeNdjsonSerializer"
                 # "MapboxVectorTileSerializer"
-                Optional("serializer"): Any(None, str),  # ???
+                Optional("serializer"): none_or_str,  # ???
                 # :arg serializers: optional dict of serializer instances that will be
                 # used for deserializing data coming from the server. (key is the
                 # mimetype), e.g.: {'mimetype':'serializer'}
@@ -382,16 +389,16 @@ def config_schema() -> Schema:
                 # "CompatibilityModeNdjsonSerializer"
                 # "MapboxVectorTileSerializer"
                 Optional("serializers"): Any(None, dict),
-                Optional("default_mimetype"): Any(None, str),
+                Optional("default_mimetype"): none_or_str,
                 Optional("max_retries"): Any(
                     None, All(Coerce(int), Range(min=1, max=100))
                 ),
                 # retry_on_status: Collection[int] = (429, 502, 503, 504),
                 Optional("retry_on_status"): Any(None, tuple),
-                Optional("retry_on_timeout"): Boolean(),
-                Optional("sniff_on_start"): Boolean(),
-                Optional("sniff_before_requests"): Boolean(),
-                Optional("sniff_on_node_failure"): Boolean(),
+                Optional("retry_on_timeout"): boolean,
+                Optional("sniff_on_start"): boolean,
+                Optional("sniff_before_requests"): boolean,
+                Optional("sniff_on_node_failure"): boolean,
                 Optional("sniff_timeout"): Any(
                     None, All(Coerce(float), Range(min=0.1, max=100.0))
                 ),
@@ -404,16 +411,15 @@ def config_schema() -> Schema:
                 #         Union[List[NodeConfig], List[NodeConfig]],
                 #     ]
                 # ] = None,
-                Optional("sniffed_node_callback"): Any(None, str),
-                Optional("meta_header"): Boolean(),
+                Optional("sniffed_node_callback"): none_or_str,
+                Optional("meta_header"): boolean,
                 # Cannot specify both 'request_timeout' and 'timeout'
                 # Optional('timeout', default=10.0): All(Coerce(float),
                 #     Range(min=1, max=120)),
                 # Cannot specify both 'randomize_hosts' and 'randomize_nodes_in_pool'
                 # Optional('randomize_hosts', default=True): Boolean(),
-                Optional("host_info_callback"): Any(
-                    None, str
-                ),  # ??? needs the name of a callback function
+                # ??? needs the name of a callback function
+                Optional("host_info_callback"): none_or_str,
                 # Cannot specify both 'sniffer_timeout' and 'min_delay_between_sniffing'
                 # Optional('sniffer_timeout', default=0.5): All(Coerce(float),
                 #     Range(min=0.1, max=10.0)),
@@ -422,7 +428,7 @@ def config_schema() -> Schema:
                 # Optional('sniff_on_connection_fail', default=False): Boolean(),
                 # Optional('http_auth'): Any(None, str),
                 #     Favor basic_auth instead
-                Optional("_transport"): Any(None, str),  # ???
+                Optional("_transport"): none_or_str,  # ???
             },
         }
     )
@@ -438,12 +444,13 @@ def version_min() -> t.Tuple:
     return VERSION_MIN
 
 
-def client_settings() -> t.Sequence[str]:
+def client_settings() -> t.Tuple[str, ...]:
     """Return the client settings"""
     return CLIENT_SETTINGS
 
 
-def config_settings() -> t.Sequence[str]:
+@lru_cache(maxsize=1)
+def config_settings() -> t.Tuple[str, ...]:
     """
     Return only the client settings likely to be used in a config file or at the
     command-line.
@@ -451,15 +458,13 @@ def config_settings() -> t.Sequence[str]:
     This means ignoring some that are valid in
     :py:class:`~.elasticsearch8.Elasticsearch` but are handled different locally.
     Namely, ``api_key`` is handled by :py:class:`~.es_client.builder.OtherArgs`.
+
+    The result is computed once and cached, so it is returned as an immutable tuple.
     """
     ignore = ["api_key"]
-    settings = []
-    for setting in CLIENT_SETTINGS:
-        if setting not in ignore:
-            settings.append(setting)
-    return settings
+    return tuple(setting for setting in CLIENT_SETTINGS if setting not in ignore)
 
 
-def other_settings() -> t.Sequence[str]:
+def other_settings() -> t.Tuple[str, ...]:
     """Return the other settings"""
     return OTHER_SETTINGS
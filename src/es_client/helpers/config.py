@@ -1,11 +1,14 @@
 """Command-line configuration parsing and client builder helper functions"""
 
+# The __future__ annotations line allows support for Python 3.8 and 3.9 to continue
+from __future__ import annotations
 import typing as t
 import logging
+from collections.abc import Mapping
+from importlib import import_module
 from shutil import get_terminal_size
 from dotmap import DotMap  # type: ignore
-from click import Context, secho, option as clickopt
-from elasticsearch8 import Elasticsearch
+from click import Command, Context, Group, secho, option as clickopt
 from es_client.builder import Builder
 from es_client.defaults import CLICK_SETTINGS, ENV_VAR_PREFIX, config_settings
 from es_client.exceptions import ESClientException, ConfigurationError
@@ -16,12 +19,90 @@ from es_client.helpers.utils import (
     verify_url_schema,
 )
 
+if t.TYPE_CHECKING:
+    from elasticsearch8 import Elasticsearch
+
+logger = logging.getLogger(__name__)
+
+# Client settings accepted from the command-line, for constant-time membership tests
+_CONFIG_SETTINGS = frozenset(config_settings())
+
+
+class _LazyCommand(Command):
+    """
+    Stands in for a :py:class:`LazyGroup` subcommand with a static `short_help`, so
+    listing it in ``--help`` output does not import it. The real command is only
+    loaded when a context is made for it, i.e. when it is run.
+    """
+
+    def __init__(self, name: str, load: t.Callable[[str], Command], short_help: str):
+        super().__init__(name, short_help=short_help)
+        self.load = load
+
+    def make_context(self, info_name, args, parent=None, **extra) -> Context:
+        return self.load(self.name).make_context(
+            info_name, args, parent=parent, **extra
+        )
+
+
+class LazyGroup(Group):
+    """
+    :param lazy_subcommands: Maps a command name to a tuple of
+        ``(module_name, attribute_name)``, or ``(module_name, attribute_name,
+        short_help)``
+
+    Click :py:class:`Group <click.Group>` which only imports, and builds, a lazy
+    subcommand when that subcommand is requested.
+
+    The attribute can be the :py:class:`Command <click.Command>` itself, or a function
+    returning one, in which case the command's options are not constructed until the
+    function is called.
+
+    If `short_help` is provided, it is shown in the group's ``--help`` output in place
+    of the command's own, so listing the commands does not import their modules.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_subcommands: t.Union[t.Dict[str, t.Tuple[str, ...]], None] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+        self._loaded: t.Dict[str, Command] = {}
+
+    def list_commands(self, ctx: Context) -> t.List[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx: Context, cmd_name: str) -> t.Union[Command, None]:
+        if cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+        lazy = self.lazy_subcommands[cmd_name]
+        if cmd_name not in self._loaded and len(lazy) > 2:
+            return _LazyCommand(cmd_name, self._load, lazy[2])
+        return self._load(cmd_name)
+
+    def _load(self, cmd_name: str) -> Command:
+        """
+        :param cmd_name: The name of a lazy subcommand
+
+        :returns: The subcommand, imported and built the first time it is requested
+        """
+        if cmd_name not in self._loaded:
+            modname, attrname = self.lazy_subcommands[cmd_name][:2]
+            cmd = getattr(import_module(modname), attrname)
+            if not isinstance(cmd, Command):
+                cmd = cmd()
+            self._loaded[cmd_name] = cmd
+        return self._loaded[cmd_name]
+
 
 def cli_opts(
     value: str,
     settings: t.Union[t.Dict, None] = None,
     onoff: t.Union[t.Dict, None] = None,
-    override: t.Union[t.Dict, None] = None,
+    override: t.Union[t.Mapping, None] = None,
 ) -> t.Tuple[t.Tuple[str,], t.Dict]:
     """
     :param value: The command-line :py:class:`option <click.Option>` name. The key must
@@ -41,7 +122,7 @@ def cli_opts(
     :type value: str
     :type settings: dict
     :type onoff: dict
-    :type override: dict
+    :type override: :py:class:`~collections.abc.Mapping`
 
     :rtype: Tuple
     :returns: A value suitable to use with the :py:func:`click.option` decorator,
@@ -127,10 +208,10 @@ def cli_opts(
     .. _Click boolean option:
       https://click.palletsprojects.com/en/8.1.x/options/#boolean-flags
     """
-    if override is None:
-        override = {}
     if settings is None:
         settings = CLICK_SETTINGS
+    if override is None:
+        override = {}
     if not isinstance(settings, dict):
         raise ConfigurationError(f'"settings" is not a dictionary: {type(settings)}')
     if value not in settings:
@@ -169,8 +250,7 @@ def cloud_id_override(args: t.Dict, ctx: Context) -> t.Dict:
     separate object. It would be a pain and unnecessary to make another entry in
     :py:attr:`ctx.obj <click.Context.obj>` for this.
     """
-    logger = logging.getLogger(__name__)
-    if "cloud_id" in ctx.params and ctx.params["cloud_id"]:
+    if ctx.params.get("cloud_id"):
         logger.debug(
             "cloud_id from command-line superseding configuration file settings"
         )
@@ -285,11 +365,14 @@ def get_client(
     configdict: t.Union[t.Dict, None] = None,
     configfile: t.Union[str, None] = None,
     autoconnect: bool = False,
+    reuse_client: bool = False,
 ) -> Elasticsearch:
     """
     :param configdict: A configuration dictionary
     :param configfile: A YAML configuration file
     :param autoconnect: Connect to client automatically
+    :param reuse_client: Return the same client for identical ``client`` settings,
+        rather than building a new one each call
 
     :returns: A client connection object
     :rtype: :py:class:`~.elasticsearch.Elasticsearch`
@@ -302,14 +385,21 @@ def get_client(
 
     If both are provided, `configdict` will be used, and `configfile` ignored.
 
+    With `reuse_client`, scripts or tests which call this repeatedly against the same
+    cluster skip building a new connection pool and TLS session every time. See
+    :py:meth:`~.es_client.builder.Builder.close_cached_clients` for how to release
+    those clients.
+
     Raises :py:exc:`ESClientException <es_client.exceptions.ESClientException>` if
     unable to connect.
     """
-    logger = logging.getLogger(__name__)
     logger.debug("Creating client object and testing connection")
 
     builder = Builder(
-        configdict=configdict, configfile=configfile, autoconnect=autoconnect
+        configdict=configdict,
+        configfile=configfile,
+        autoconnect=autoconnect,
+        reuse_client=reuse_client,
     )
 
     try:
@@ -350,7 +440,7 @@ def get_config(ctx: Context, quiet: bool = True) -> Context:
     if ctx.params["config"]:
         ctx.obj["draftcfg"] = get_yaml(ctx.params["config"])
     # If no config was provided, but default config path exists, use it instead
-    elif "default_config" in ctx.obj and ctx.obj["default_config"]:
+    elif ctx.obj.get("default_config"):
         if not quiet:
             secho(
                 f"Using default configuration file at {ctx.obj['default_config']}",
@@ -377,18 +467,15 @@ def get_hosts(ctx: Context) -> t.Union[t.Sequence[str], None]:
     Raises a :py:exc:`ConfigurationError <es_client.exceptions.ConfigurationError>` if
     schema validation fails.
     """
-    logger = logging.getLogger(__name__)
-    hostslist = []
-    if "hosts" in ctx.params and ctx.params["hosts"]:
-        for host in list(ctx.params["hosts"]):
-            try:
-                hostslist.append(verify_url_schema(host))
-            except ConfigurationError as err:
-                logger.error("Incorrect URL Schema: %s", err)
-                raise ConfigurationError from err
-    else:
+    hosts = ctx.params.get("hosts")
+    if not hosts:
         return None
-    return hostslist
+    try:
+        return [verify_url_schema(host) for host in hosts]
+    except ConfigurationError as err:
+        # The message names the offending host
+        logger.error("Incorrect URL Schema: %s", err)
+        raise ConfigurationError from err
 
 
 def get_width() -> t.Dict:
@@ -429,8 +516,7 @@ def hosts_override(args: t.Dict, ctx: Context) -> t.Dict:
     separate object. It would be a pain and unnecessary to make another entry in
     :py:attr:`ctx.obj <click.Context.obj>` for this.
     """
-    logger = logging.getLogger(__name__)
-    if "hosts" in ctx.params and ctx.params["hosts"]:
+    if ctx.params.get("hosts"):
         logger.debug("hosts from command-line superseding configuration file settings")
         ctx.obj["client_args"].hosts = None
         ctx.obj["client_args"].cloud_id = None
@@ -446,9 +532,9 @@ def options_from_dict(options_dict) -> t.Callable:
             # Shorten our "if" statements by making dct shorthand for
             # options_dict[option]
             dct = options_dict[option]
-            onoff = dct["onoff"] if "onoff" in dct else None
-            override = dct["override"] if "override" in dct else None
-            settings = dct["settings"] if "settings" in dct else None
+            onoff = dct.get("onoff")
+            override = dct.get("override")
+            settings = dct.get("settings")
             if settings is None:
                 settings = CLICK_SETTINGS[option]
             argval = f"--{option}"
@@ -482,18 +568,17 @@ def override_client_args(ctx: Context) -> None:
     log to debug that this is the case, and that the default value for ``hosts`` of
     ``http://127.0.0.1:9200`` will be used.
     """
-    logger = logging.getLogger(__name__)
     args = {}
     # Populate args from ctx.params
     for key, value in ctx.params.items():
-        if key in config_settings():
+        if key in _CONFIG_SETTINGS:
             if key == "hosts":
-                args[key] = get_hosts(ctx)
-            elif value is not None:
+                value = get_hosts(ctx)
+            # Same test as prune_nones, so args needs no second pass
+            if value is not None and value != "None":
                 args[key] = value
     args = cloud_id_override(args, ctx)
     args = hosts_override(args, ctx)
-    args = prune_nones(args)
     # Update the object if we have settings to override after pruning None values
     if args:
         for arg in args:
@@ -520,31 +605,20 @@ def override_other_args(ctx: Context) -> None:
 
     Update :py:attr:`ctx.obj['other_args'] <click.Context.obj>` with the results.
     """
-    logger = logging.getLogger(__name__)
-    apikey = prune_nones(
-        {
-            "id": ctx.params["id"],
-            "api_key": ctx.params["api_key"],
-            "token": ctx.params["api_token"],
-        }
-    )
-    args = prune_nones(
-        {
-            "master_only": ctx.params["master_only"],
-            "skip_version_test": ctx.params["skip_version_test"],
-            "username": ctx.params["username"],
-            "password": ctx.params["password"],
-        }
-    )
-    args["api_key"] = apikey
-
-    # Remove `api_key` root key if `id` and `api_key` and `token` are all None
-    if (
-        ctx.params["id"] is None
-        and ctx.params["api_key"] is None
-        and ctx.params["api_token"] is None
-    ):
-        del args["api_key"]
+    args = {}
+    for key in ("master_only", "skip_version_test", "username", "password"):
+        value = ctx.params.get(key)
+        # Same test as prune_nones, without building and then filtering a dict
+        if value is not None and value != "None":
+            args[key] = value
+    # Only add an `api_key` root key if any of `id`, `api_key` or `token` is set
+    apikey = {}
+    for key, param in (("id", "id"), ("api_key", "api_key"), ("token", "api_token")):
+        value = ctx.params.get(param)
+        if value is not None and value != "None":
+            apikey[key] = value
+    if apikey:
+        args["api_key"] = apikey
 
     if args:
         for arg in args:
@@ -552,16 +626,17 @@ def override_other_args(ctx: Context) -> None:
         ctx.obj["other_args"].update(DotMap(args))
 
 
-def override_settings(settings: t.Dict, override: t.Dict) -> t.Dict:
+def override_settings(settings: t.Mapping, override: t.Mapping) -> t.Dict:
     """
     :param settings: The source data
     :param override: The data which will override `settings`
 
     :type settings: dict
-    :type override: dict
+    :type override: :py:class:`~collections.abc.Mapping`
 
     :rtype: dict
-    :returns: An dictionary based on `settings` updated with values from `override`
+    :returns: A new dictionary based on `settings` updated with values from `override`.
+        `settings` itself is not modified.
 
     This function is called by :func:`cli_opts()` in order to override settings used in
     a :py:class:`Click Option <click.Option>`.
@@ -598,10 +673,8 @@ def override_settings(settings: t.Dict, override: t.Dict) -> t.Dict:
 
     The default setting KEY of ``OPTION2`` would be overriden by NEWVALUE.
     """
-    if not isinstance(override, dict):
-        raise ConfigurationError(f"override must be of type dict: {type(override)}")
-    for key in list(override.keys()):
-        # This formerly checked for the presence of key in settings, but override
-        # should add non-existing keys if desired.
-        settings[key] = override[key]
-    return settings
+    if not isinstance(override, Mapping):
+        raise ConfigurationError(f"override must be a mapping: {type(override)}")
+    # This formerly checked for the presence of key in settings, but override should
+    # add non-existing keys if desired.
+    return {**settings, **override}
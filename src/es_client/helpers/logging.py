@@ -3,22 +3,60 @@
 # The __future__ annotations line allows support for Python 3.8 and 3.9 to continue
 from __future__ import annotations
 import typing as t
+import os
 import sys
 import json
 import logging
 import time
+from functools import lru_cache
 from pathlib import Path
-from voluptuous import Schema
 from click import Context, echo as clicho
-import ecs_logging
-from es_client.exceptions import LoggingException
 from es_client.defaults import config_logging, LOGDEFAULTS
 from es_client.helpers.schemacheck import SchemaCheck
 from es_client.helpers.utils import ensure_list, prune_nones
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # pylint: disable=invalid-name
+
+if t.TYPE_CHECKING:
+    from voluptuous import Schema
+
 # pylint: disable=R0903
 
 
+def _dumps(data: t.Dict, use_orjson: bool = False) -> str:
+    """
+    :param data: A log message as a dictionary
+    :param use_orjson: Serialize with the much faster
+        `orjson <https://github.com/ijl/orjson>`_, if it is installed. Its output is
+        compact and not ASCII-escaped, so it is not byte-for-byte the same.
+
+    :returns: `data` as JSON with sorted keys
+    """
+    if use_orjson and orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+    return json.dumps(data, sort_keys=True)
+
+
+# The root handler and blacklist filter set_logging last installed, so that calling
+# it again replaces them instead of stacking duplicates
+_INSTALLED: t.Dict[str, t.Any] = {}
+
+# Every level name the logging module defines, including the WARN and FATAL aliases
+_LOGLEVELS: t.Dict[str, int] = {
+    "NOTSET": logging.NOTSET,
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARN": logging.WARN,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "FATAL": logging.FATAL,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
 class Whitelist(logging.Filter):
     """
     Child class inheriting :py:class:`logging.Filter`, patched to permit only
@@ -35,10 +73,23 @@ class Whitelist(logging.Filter):
 
                 ['es_client.helpers.config', 'es_client.builder']
         """
+        #: A :py:class:`logging.Filter` per name, for callers inspecting the filter.
+        #: Matching is done with ``names``, so changing this list has no effect.
         self.whitelist = [logging.Filter(name) for name in whitelist]
+        self.names = frozenset(whitelist)
+        # An empty name matches every logger, as it does for logging.Filter
+        self.match_all = "" in self.names
 
     def filter(self, record):
-        return any(f.filter(record) for f in self.whitelist)
+        # Same matching as logging.Filter: the logger itself or any of its parents
+        # (by dotted name) being listed is a match
+        name = record.name
+        while name not in self.names:
+            idx = name.rfind(".")
+            if idx < 0:
+                return self.match_all
+            name = name[:idx]
+        return True
 
 
 class Blacklist(Whitelist):
@@ -58,7 +109,17 @@ class Blacklist(Whitelist):
 
 
 class JSONFormatter(logging.Formatter):
-    """JSON message formatting"""
+    """
+    JSON message formatting
+
+    Set :py:attr:`USE_ORJSON` to ``True`` in a subclass to serialize with
+    `orjson <https://github.com/ijl/orjson>`_ (``pip install es_client[orjson]``)
+    where it is installed. The output is then compact and not ASCII-escaped.
+    """
+
+    #: Opt in to orjson serialization. Off by default, so the log output does not
+    #: depend on which packages happen to be installed.
+    USE_ORJSON = False
 
     # The LogRecord attributes we want to carry over to the JSON message,
     # mapped to the corresponding output key.
@@ -70,33 +131,41 @@ class JSONFormatter(logging.Formatter):
         "name": "name",
     }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.converter = time.gmtime
+
     def format(self, record: logging.LogRecord) -> str:
         """
         :param record: The incoming log message
 
         :rtype: :py:meth:`json.dumps`
         """
-        self.converter = time.gmtime
         timestamp = (
             f"{self.formatTime(record, datefmt='%Y-%m-%dT%H:%M:%S')}.{record.msecs:03}Z"
         )
-        result = {"@timestamp": timestamp}
-        available = record.__dict__
-        # This is cleverness because 'message' is NOT a member key of
-        # ``record.__dict__`` the ``getMessage()`` method is effectively ``msg % args``
-        # (actual keys) By manually adding 'message' to ``available``, it simplifies
-        # the code
-        available["message"] = record.getMessage()
-        for attribute in set(self.WANTED_ATTRS).intersection(available):
-            result = deepmerge(
-                de_dot(self.WANTED_ATTRS[attribute], getattr(record, attribute)), result
-            )
+        # 'message' is NOT a member key of ``record.__dict__``. The ``getMessage()``
+        # method is effectively ``msg % args``
+        message = record.getMessage()
+        result: t.Dict[str, t.Any] = {"@timestamp": timestamp}
+        for attribute, key in self.WANTED_ATTRS.items():
+            if attribute == "message":
+                value = message
+            elif attribute in record.__dict__:
+                value = record.__dict__[attribute]
+            else:
+                continue
+            # Nest dotted keys, e.g. 'log.original', in a single walk
+            *parents, last = key.split(".")
+            dest = result
+            for parent in parents:
+                dest = dest.setdefault(parent, {})
+            dest[last] = value
         # The following is mostly for mimicking the ecs format. You can't have 2x
         # 'message' keys in WANTED_ATTRS, so we set the value to 'log.original' for
-        # ecs, and this code block guarantees it still appears as 'message' too.
-        if "message" not in result.items():
-            result["message"] = available["message"]
-        return json.dumps(result, sort_keys=True)
+        # ecs, and this guarantees it still appears as 'message' too.
+        result["message"] = message
+        return _dumps(result, self.USE_ORJSON)
 
 
 def check_logging_config(config: t.Dict) -> Schema:
@@ -164,24 +233,12 @@ def de_dot(dot_string: str, msg: str) -> t.Union[t.Dict[str, str], None]:
     :rtype: dict
     :returns: A nested dictionary of keys with the final value being the message
 
-    Turn `message` and `dot_string` into a nested dictionary. Used by
-    :py:class:`JSONFormatter`
+    Turn `message` and `dot_string` into a nested dictionary.
+    :py:class:`JSONFormatter` now nests its keys inline rather than calling this.
     """
-    arr = dot_string.split(".")
-    arr.append(msg)
-    retval = None
-    for idx in range(len(arr), 1, -1):
-        if not retval:
-            try:
-                retval = {arr[idx - 2]: arr[idx - 1]}
-            except Exception as err:
-                raise LoggingException(err) from err
-        else:
-            try:
-                new_d = {arr[idx - 2]: retval}
-                retval = new_d
-            except Exception as err:
-                raise LoggingException(err) from err
+    retval: t.Any = msg
+    for key in reversed(dot_string.split(".")):
+        retval = {key: retval}
     return retval
 
 
@@ -197,7 +254,6 @@ def deepmerge(source: t.Dict, destination: t.Dict) -> t.Dict:
     :rtype: dict
 
     Recursively merge deeply nested dictionary structure `source` into `destination`.
-    Used by :py:class:`JSONFormatter`
     """
     for key, value in source.items():
         if isinstance(value, dict):
@@ -208,6 +264,33 @@ def deepmerge(source: t.Dict, destination: t.Dict) -> t.Dict:
     return destination
 
 
+@lru_cache(maxsize=8)
+def get_formatter(logformat: t.Union[str, None], debug: bool) -> logging.Formatter:
+    """
+    :param logformat: One of ``default``, ``json`` or ``ecs``
+    :param debug: Whether the log level is ``DEBUG``
+
+    :returns: The formatter for `logformat`
+
+    Formatters keep no per-record state, so one of each is made and then shared by
+    every handler :func:`set_logging` sets up.
+    """
+    if logformat == "json":
+        return JSONFormatter()
+    if logformat == "ecs":
+        # Only imported when the ecs format is actually requested
+        # pylint: disable=import-outside-toplevel
+        import ecs_logging
+
+        return ecs_logging.StdlibFormatter()
+    if debug:
+        return logging.Formatter(
+            "%(asctime)s %(levelname)-9s %(name)22s "
+            "%(funcName)22s:%(lineno)-4d %(message)s"
+        )
+    return logging.Formatter("%(asctime)s %(levelname)-9s %(message)s")
+
+
 def get_handler(logfile: t.Union[str, None]) -> logging.Handler:
     """
     :param logfile: The path of a log file
@@ -243,16 +326,22 @@ def get_handler(logfile: t.Union[str, None]) -> logging.Handler:
         fpath = "/proc/1/fd/1"
         permission = False
         try:
-            with open(fpath, "wb+", buffering=0) as fhdl:
-                # And we've verified that the path is a tty
-                if fhdl.isatty():
-                    # And verified that we have write permissions to that path
-                    fhdl.write("...\n".encode())
-                    permission = True
+            # Opening for writing is the write permission check, so nothing needs to
+            # be written to the container's output to prove it
+            fdesc = os.open(fpath, os.O_WRONLY | os.O_NONBLOCK)
         except PermissionError:
             clicho(
                 f"Docker container does not appear to have a writable tty at {fpath}."
             )
+        except OSError:
+            # Nothing usable at fpath, so fall back to STDOUT
+            pass
+        else:
+            try:
+                # And verify that the path is a tty
+                permission = os.isatty(fdesc)
+            finally:
+                os.close(fdesc)
         if permission:
             return logging.FileHandler(fpath)
     return logging.StreamHandler(stream=sys.stdout)  # Default
@@ -303,24 +392,27 @@ def get_numeric_loglevel(level: str) -> int:
 
     Raises a :py:exc:`ValueError` exception if an invalid value for `level` is provided.
     """
-    numeric_log_level = getattr(logging, level.upper(), None)
-
-    if not isinstance(numeric_log_level, int):
-        raise ValueError(f"Invalid log level: {level}")
-    return numeric_log_level
+    try:
+        return _LOGLEVELS[level.upper()]
+    except KeyError as exc:
+        raise ValueError(f"Invalid log level: {level}") from exc
 
 
+@lru_cache(maxsize=1)
 def is_docker() -> bool:
     """
     :rtype: bool
     :returns: Boolean result of whether we are runinng in a Docker container or not
+
+    This cannot change while the process runs, so it is only worked out once.
     """
-    cgroup = Path("/proc/self/cgroup")
-    return (
-        Path("/.dockerenv").is_file()
-        or cgroup.is_file()
-        and "docker" in cgroup.read_text(encoding="utf8")
-    )
+    if Path("/.dockerenv").is_file():
+        return True
+    try:
+        # No need to decode the file just to search it
+        return b"docker" in Path("/proc/self/cgroup").read_bytes()
+    except OSError:
+        return False
 
 
 def override_logging(ctx: Context) -> t.Dict:
@@ -338,36 +430,32 @@ def override_logging(ctx: Context) -> t.Dict:
     init_logcfg = check_logging_config(ctx.obj["draftcfg"])
 
     # Set debug to True if config file says loglevel is DEBUG
-    debug = "loglevel" in init_logcfg and init_logcfg["loglevel"] == "DEBUG"
+    debug = init_logcfg.get("loglevel") == "DEBUG"
     # if 'loglevel' is not None
-    if "loglevel" in ctx.params and ctx.params["loglevel"] is not None:
+    if ctx.params.get("loglevel") is not None:
         # Set debug to True if command-line options says loglevel is DEBUG,
         # otherwise set debug to False (overriding what was set by config file)
         debug = ctx.params["loglevel"] == "DEBUG"
 
-    # Override anything with options from the command-line
-    paramlist = ["loglevel", "logfile", "logformat", "blacklist"]
-
-    for entry in paramlist:
-        if entry in ctx.params:
-            if not ctx.params[entry]:
-                continue
-            # Output to stdout if debug is True and we're not overriding a None
-            # (the default) and we're not overriding DEBUG with DEBUG ;)
-            if (
-                debug
-                and init_logcfg[entry] is not None
-                and init_logcfg["loglevel"] != "DEBUG"
-            ):
-                clicho(
-                    f"DEBUG: Overriding configuration file setting {entry}="
-                    f"{init_logcfg[entry]} with command-line option {entry}="
-                    f"{ctx.params[entry]}"
-                )
-            if entry == "blacklist":
-                init_logcfg[entry] = list(ctx.params[entry])
-            else:
-                init_logcfg[entry] = ctx.params[entry]
+    # Override anything with options from the command-line. LOGDEFAULTS is keyed by
+    # the four logging options: loglevel, logfile, logformat and blacklist
+    for entry in LOGDEFAULTS:
+        value = ctx.params.get(entry)
+        # Absent, None and empty values leave the config file setting alone
+        if not value:
+            continue
+        # Output to stdout if debug is True and we're not overriding a None
+        # (the default) and we're not overriding DEBUG with DEBUG ;)
+        if (
+            debug
+            and init_logcfg[entry] is not None
+            and init_logcfg["loglevel"] != "DEBUG"
+        ):
+            clicho(
+                f"DEBUG: Overriding configuration file setting {entry}="
+                f"{init_logcfg[entry]} with command-line option {entry}={value}"
+            )
+        init_logcfg[entry] = list(value) if entry == "blacklist" else value
 
     return init_logcfg
 
@@ -389,34 +477,40 @@ def set_logging(options: t.Dict, logger_name: str = "es_client") -> None:
     :param logger_name: Default logger name to use in :py:func:`logging.getLogger()`
 
     Configure global logging options from `options` and set a default `logger_name`
+
+    Calling this again replaces the handler and blacklist filter installed by the
+    previous call, rather than adding more of them.
     """
     log_opts = check_log_opts(options)
+    previous = _INSTALLED.pop("handler", None)
+    if previous is not None:
+        logging.root.removeHandler(previous)
+        previous.close()
+    previous = _INSTALLED.pop("blacklist", None)
+    if previous is not None:
+        for hdlr in logging.root.handlers:
+            hdlr.removeFilter(previous)
     handler = get_handler(log_opts["logfile"])
+    handler.set_name(logger_name)
     numeric_log_level = get_numeric_loglevel(log_opts["loglevel"])
 
-    if numeric_log_level == 10:  # DEBUG
-        format_string = (
-            "%(asctime)s %(levelname)-9s %(name)22s "
-            "%(funcName)22s:%(lineno)-4d %(message)s"
-        )
-    else:
-        format_string = "%(asctime)s %(levelname)-9s %(message)s"
-
-    if log_opts["logformat"] == "json":
-        handler.setFormatter(JSONFormatter())
-    elif log_opts["logformat"] == "ecs":
-        handler.setFormatter(ecs_logging.StdlibFormatter())
-    else:
-        handler.setFormatter(logging.Formatter(format_string))
+    handler.setFormatter(
+        get_formatter(log_opts["logformat"], numeric_log_level == logging.DEBUG)
+    )
 
     logging.root.addHandler(handler)
+    _INSTALLED["handler"] = handler
     logging.root.setLevel(numeric_log_level)
 
     _ = logging.getLogger(logger_name)
     # Set up NullHandler() to handle nested elasticsearch8.trace Logger
     # instance in elasticsearch python client
-    logging.getLogger("elasticsearch8.trace").addHandler(logging.NullHandler())
+    trace = logging.getLogger("elasticsearch8.trace")
+    if not any(isinstance(hdlr, logging.NullHandler) for hdlr in trace.handlers):
+        trace.addHandler(logging.NullHandler())
     if log_opts["blacklist"]:
-        for entry in ensure_list(log_opts["blacklist"]):
-            for handler in logging.root.handlers:
-                handler.addFilter(Blacklist(entry))
+        # One filter holding every name, rather than one filter per name
+        blacklist = Blacklist(*ensure_list(log_opts["blacklist"]))
+        for hdlr in logging.root.handlers:
+            hdlr.addFilter(blacklist)
+        _INSTALLED["blacklist"] = blacklist
@@ -1,14 +1,20 @@
 """SchemaCheck class and associated functions"""
 
 # pylint: disable=protected-access, broad-except
+# The __future__ annotations line allows support for Python 3.8 and 3.9 to continue
+from __future__ import annotations
 import typing as t
 import logging
 from re import sub
 from copy import deepcopy
-from voluptuous import Schema
 from es_client.defaults import KEYS_TO_REDACT
 from es_client.exceptions import FailedValidation
 
+if t.TYPE_CHECKING:
+    from voluptuous import Schema
+
+logger = logging.getLogger(__name__)
+
 
 def password_filter(data: t.Dict) -> t.Dict:
     """
@@ -55,13 +61,15 @@ class SchemaCheck:
     """
 
     def __init__(self, config: t.Dict, schema: Schema, test_what: str, location: str):
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         # Set the Schema for validation...
-        self.logger.debug("Schema: %s", schema)
-        if isinstance(config, dict):
-            self.logger.debug('"%s" config: %s', test_what, password_filter(config))
-        else:
-            self.logger.debug('"%s" config: %s', test_what, config)
+        # password_filter deep copies config, so only pay for it when it gets logged
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Schema: %s", schema)
+            if isinstance(config, dict):
+                self.logger.debug('"%s" config: %s', test_what, password_filter(config))
+            else:
+                self.logger.debug('"%s" config: %s', test_what, config)
         #: Object attribute that gets the value of param `config`
         self.config = config
         #: Object attribute that gets the value of param `schema`
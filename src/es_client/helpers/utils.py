@@ -1,21 +1,67 @@
 """Helper Utility Functions"""
 
+# The __future__ annotations line allows support for Python 3.8 and 3.9 to continue
+from __future__ import annotations
 import typing as t
 import logging
 import os
 import re
 import base64
 import binascii
+from collections import OrderedDict
+from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
 import yaml  # type: ignore
 import click
-from elasticsearch8 import Elasticsearch
 from es_client.defaults import ES_DEFAULT, config_schema
 from es_client.exceptions import ConfigurationError
 from es_client.helpers.schemacheck import SchemaCheck
 
+if t.TYPE_CHECKING:
+    from elasticsearch8 import Elasticsearch
+
 logger = logging.getLogger(__name__)
 
+_VERSION = re.compile(r"^(\d+)\.(\d+)\.(\d+)")
+
+# scheme:rest[:port] for an http or https URL, with no further colons
+_URL = re.compile(r"^(https?):([^:]*)(?::([^:]*))?$")
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+# A single scalar value environment variable, e.g. ${VAR} or ${VAR:default}
+_SINGLE = re.compile(r"^\$\{(.*)\}$")
+
+
+def _single_constructor(loader, node) -> t.Union[str, None]:
+    """Resolve a ``${VAR}`` or ``${VAR:default}`` YAML scalar from the environment"""
+    value = loader.construct_scalar(node)
+    proto = _SINGLE.match(value).group(1)
+    default = None
+    if len(proto.split(":")) > 1:
+        envvar, default = proto.split(":")
+    else:
+        envvar = proto
+    return os.environ[envvar] if envvar in os.environ else default
+
+
+# Use the libyaml-backed loader where PyYAML was built with it. This must stay a
+# FullLoader, as config files may use tags such as !!python/tuple
+_BaseLoader = getattr(yaml, "CFullLoader", yaml.FullLoader)
+
+
+class _EnvVarLoader(_BaseLoader):  # pylint: disable=too-many-ancestors
+    """YAML loader which resolves ``${VAR}`` scalars from the environment"""
+
+
+_EnvVarLoader.add_implicit_resolver("!single", _SINGLE, None)
+_EnvVarLoader.add_constructor("!single", _single_constructor)
+
+# Parsed YAML files, keyed by absolute path. Each entry holds the file's mtime, size
+# and a hash of the environment (for ``${VAR}`` values) alongside the parsed data.
+_YAML_CACHE: OrderedDict[str, t.Tuple[int, int, int, t.Any]] = OrderedDict()
+_YAML_CACHE_SIZE = 16
+
 
 def check_config(config: dict, quiet: bool = False) -> dict:
     """
@@ -88,15 +134,7 @@ def get_version(client: Elasticsearch) -> t.Tuple:
 
     Get the Elasticsearch version of the connected node
     """
-    version = client.info()["version"]["number"]
-    # Split off any -dev, -beta, or -rc tags
-    version = version.split("-")[0]
-    # Only take SEMVER (drop any fields over 3)
-    if len(version.split(".")) > 3:
-        version = version.split(".")[:-1]
-    else:
-        version = version.split(".")
-    return tuple(map(int, version))
+    return parse_version(client.info()["version"]["number"])
 
 
 def get_yaml(path: str) -> t.Dict:
@@ -106,28 +144,35 @@ def get_yaml(path: str) -> t.Dict:
     :returns: The contents of `path` translated from YAML to :py:class:`dict`
 
     Read the file identified by `path` and import its YAML contents.
-    """
-    # Set the stage here to parse single scalar value environment vars from
-    # the YAML file being read
-    single = re.compile(r"^\$\{(.*)\}$")
-    yaml.add_implicit_resolver("!single", single)
-
-    def single_constructor(loader, node):
-        value = loader.construct_scalar(node)
-        proto = single.match(value).group(1)
-        default = None
-        if len(proto.split(":")) > 1:
-            envvar, default = proto.split(":")
-        else:
-            envvar = proto
-        return os.environ[envvar] if envvar in os.environ else default
 
-    yaml.add_constructor("!single", single_constructor)
+    Single scalar values of the form ``${VAR}`` or ``${VAR:default}`` are replaced
+    with the value of environment variable ``VAR`` (or ``default``, or ``None``).
 
+    Parsed files are cached until their modification time or size, or the
+    environment, changes. Callers always receive their own copy of the data.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        # Let read_file raise the usual ConfigurationError
+        stat = None
+    if stat is not None:
+        key = os.path.abspath(path)
+        env_hash = hash(frozenset(os.environ.items()))
+        hit = _YAML_CACHE.get(key)
+        if hit is not None and hit[:3] == (stat.st_mtime_ns, stat.st_size, env_hash):
+            _YAML_CACHE.move_to_end(key)
+            return deepcopy(hit[3])
     try:
-        return yaml.load(read_file(path), Loader=yaml.FullLoader)
-    except (yaml.scanner.ScannerError, yaml.parser.ParserError) as exc:
+        data = yaml.load(read_file(path), Loader=_EnvVarLoader)
+    except yaml.YAMLError as exc:
         raise ConfigurationError(f"Unable to parse YAML file. Error: {exc}") from exc
+    if stat is not None:
+        _YAML_CACHE[key] = (stat.st_mtime_ns, stat.st_size, env_hash, data)
+        if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+            _YAML_CACHE.popitem(last=False)
+        data = deepcopy(data)
+    return data
 
 
 def option_wrapper() -> t.Callable:
@@ -156,6 +201,23 @@ def parse_apikey_token(token: str) -> t.Tuple:
     return (split[0], split[1])
 
 
+def parse_version(number: str) -> t.Tuple:
+    """
+    :param number: An Elasticsearch version string, e.g. ``8.12.0``
+
+    :returns: The version as a 3-part tuple, (major, minor, patch)
+
+    Parse the ``version.number`` value from an :meth:`Elasticsearch.info()
+    <elasticsearch8.Elasticsearch.info>` response
+    """
+    # Only take SEMVER, ignoring any -dev, -beta, -rc or further dotted fields
+    match = _VERSION.match(number)
+    if match is None:
+        raise ValueError(f"Unable to parse Elasticsearch version: {number}")
+    major, minor, patch = match.groups()
+    return (int(major), int(minor), int(patch))
+
+
 def passthrough(func) -> t.Callable:
     """Wrapper to make it easy to store click configuration elsewhere"""
     return lambda a, k: func(*a, **k)
@@ -168,7 +230,7 @@ def prune_nones(mydict: t.Dict) -> t.Dict:
     Remove keys from `mydict` whose values are `None`
     """
     # Test for `None` instead of existence or zero values will be caught
-    return dict([(k, v) for k, v in mydict.items() if v is not None and v != "None"])
+    return {k: v for k, v in mydict.items() if v is not None and v != "None"}
 
 
 def read_file(myfile: str) -> str:
@@ -197,17 +259,14 @@ def verify_ssl_paths(args: t.Dict) -> None:
     :py:func:`~.es_client.helpers.utils.read_file` function will raise a
     :py:exc:`~.es_client.exceptions.ConfigurationError` if a file fails to be read.
     """
-    # Test whether certificate is a valid file path
-    if "ca_certs" in args and args["ca_certs"] is not None:
-        read_file(args["ca_certs"])
-    # Test whether client_cert is a valid file path
-    if "client_cert" in args and args["client_cert"] is not None:
-        read_file(args["client_cert"])
-    # Test whether client_key is a valid file path
-    if "client_key" in args and args["client_key"] is not None:
-        read_file(args["client_key"])
+    # Test whether ca_certs, client_cert and client_key are valid file paths
+    for key in ("ca_certs", "client_cert", "client_key"):
+        path = args.get(key)
+        if path is not None:
+            read_file(path)
 
 
+@lru_cache(maxsize=256)
 def verify_url_schema(url: str) -> str:
     """
     :param url: The url to verify
@@ -218,21 +277,16 @@ def verify_url_schema(url: str) -> str:
 
     Raise a :py:exc:`~.es_client.exceptions.ConfigurationError` exception if a URL
     schema is invalid for any reason.
+
+    Results are cached, so the same host seen by repeated Builder instances is only
+    verified once per process.
     """
-    parts = url.lower().split(":")
-    errmsg = f"URL Schema invalid for {url}"
-    if len(parts) < 3:
+    match = _URL.match(url.lower())
+    if match is None:
+        # Only build the message when there is an error to report
+        raise ConfigurationError(f"URL Schema invalid for {url}")
+    scheme, rest, port = match.groups()
+    if port is None:
         # We do not have a port
-        if parts[0] == "https":
-            port = "443"
-        elif parts[0] == "http":
-            port = "80"
-        else:
-            raise ConfigurationError(errmsg)
-    elif len(parts) == 3:
-        if (parts[0] != "http") and (parts[0] != "https"):
-            raise ConfigurationError(errmsg)
-        port = parts[2]
-    else:
-        raise ConfigurationError(errmsg)
-    return parts[0] + ":" + parts[1] + ":" + port
+        port = _DEFAULT_PORTS[scheme]
+    return f"{scheme}:{rest}:{port}"
@@ -1,11 +1,13 @@
 """Test helpers.schemacheck"""
 
+import os
 from unittest import TestCase
+from unittest.mock import Mock, patch
 import certifi
 import click
 import pytest
-from es_client.builder import Builder
-from es_client.exceptions import ConfigurationError
+from es_client.builder import Builder, _certifi_where, _load_validated
+from es_client.exceptions import ConfigurationError, FailedValidation
 from . import FileTestObj
 
 DEFAULT = {"elasticsearch": {"client": {"hosts": ["http://127.0.0.1:9200"]}}}
@@ -37,6 +39,66 @@ class TestInit(TestCase):
         # Teardown
         file_obj.teardown()
 
+    def test_read_config_file_cached(self):
+        """
+        Ensure that an unchanged config file is only parsed once, and that a changed
+        one is read again
+        """
+        es_url = "http://127.0.0.1:9200"
+        new_url = "http://127.0.0.2:9200"
+        # Build
+        file_obj = FileTestObj()
+        file_obj.write_config(file_obj.args["configfile"], YAMLCONFIG.format(es_url))
+        # Test
+        Builder(configfile=file_obj.args["configfile"])
+        hits = _load_validated.cache_info().hits
+        build_obj = Builder(configfile=file_obj.args["configfile"])
+        assert _load_validated.cache_info().hits == hits + 1
+        assert build_obj.client_args.hosts[0] == es_url
+        file_obj.write_config(file_obj.args["configfile"], YAMLCONFIG.format(new_url))
+        stat = os.stat(file_obj.args["configfile"])
+        os.utime(
+            file_obj.args["configfile"],
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+        )
+        build_obj = Builder(configfile=file_obj.args["configfile"])
+        assert build_obj.client_args.hosts[0] == new_url
+        # Teardown
+        file_obj.teardown()
+
+    def test_configdict_cached(self):
+        """Ensure an identical configdict is only validated once"""
+        test = {"elasticsearch": {"client": {"hosts": ["http://127.0.0.3:9200"]}}}
+        Builder(configdict=test)
+        with patch("es_client.builder.check_config") as mock_check:
+            build_obj = Builder(configdict=test)
+        mock_check.assert_not_called()
+        assert build_obj.client_args.hosts == ["http://127.0.0.3:9200"]
+
+    def test_configdict_cache_keeps_types(self):
+        """Ensure a list is still validated after an equal tuple has been cached"""
+        client = {"hosts": ["http://127.0.0.5:9200"], "retry_on_status": (429, 503)}
+        Builder(configdict={"elasticsearch": {"client": client}})
+        client = {**client, "retry_on_status": [429, 503]}
+        with pytest.raises(FailedValidation):
+            Builder(configdict={"elasticsearch": {"client": client}})
+
+    def test_configdict_not_modified(self):
+        """Ensure validation leaves the caller's configdict as it was"""
+        test = {"elasticsearch": {"client": {"hosts": ["http://127.0.0.4:9200"]}}}
+        Builder(configdict=test)
+        assert test == {
+            "elasticsearch": {"client": {"hosts": ["http://127.0.0.4:9200"]}}
+        }
+
+    def test_defaults_cached(self):
+        """Ensure the default configuration is only validated once"""
+        Builder()
+        with patch("es_client.builder.check_config") as mock_check:
+            build_obj = Builder()
+        mock_check.assert_not_called()
+        assert build_obj.client_args.hosts == ["http://127.0.0.1:9200"]
+
     def test_assign_defaults(self):
         """
         Ensure that the default URL is passed to hosts when an empty config dict is
@@ -76,12 +138,32 @@ class TestInit(TestCase):
         obj = Builder(configdict=test)
         assert "https://127.0.0.1:443" == obj.client_args.hosts[0]
 
+    def test_url_schema_duplicate_hosts(self):
+        """Ensure repeated hosts are only kept once, in their original order"""
+        hosts = [
+            "http://127.0.0.2:9200",
+            "http://127.0.0.1:9200",
+            "http://127.0.0.2:9200",
+        ]
+        test = {"elasticsearch": {"client": {"hosts": hosts}}}
+        obj = Builder(configdict=test)
+        assert obj.client_args.hosts == hosts[:2]
+
     def test_url_schema_validation_raises(self):
         """Ensure that ConfigurationError is raised with an invalid host URL schema"""
         test = {"elasticsearch": {"client": {"hosts": ["127.0.0.1:9200"]}}}
         with pytest.raises(ConfigurationError):
             _ = Builder(configdict=test)
 
+    def test_url_schema_validation_reports_all(self):
+        """Ensure that every invalid host is named in the ConfigurationError"""
+        bad = ["127.0.0.1:9200", "ftp://127.0.0.2:9200"]
+        test = {"elasticsearch": {"client": {"hosts": ["http://127.0.0.1:9200", *bad]}}}
+        with pytest.raises(ConfigurationError) as err:
+            _ = Builder(configdict=test)
+        for host in bad:
+            assert host in str(err.value)
+
 
 class TestAuth(TestCase):
     """Test authentication methods"""
@@ -145,6 +227,12 @@ class TestAuth(TestCase):
         obj = Builder(configdict=test)
         assert obj.client_args.api_key is None
 
+    def test_api_key_absent(self):
+        """Ensure an empty api_key leaves both other_args and client_args alone"""
+        obj = Builder(configdict=DEFAULT)
+        assert not obj.other_args.api_key
+        assert obj.client_args.api_key is None
+
     def test_proper_api_key(self):
         """Ensure that API key value is assigned to client_args when properly passed"""
         api_id = "foo"
@@ -198,6 +286,232 @@ class TestAuth(TestCase):
         assert (usr, pwd) == obj.client_args.basic_auth
 
 
+class TestFindMaster(TestCase):
+    """Test _find_master with a mocked client"""
+
+    def test_is_master(self):
+        """Ensure the local node id is compared with the elected master id"""
+        obj = Builder(configdict=DEFAULT)
+        obj.client = Mock()
+        obj.client.nodes.info.return_value = {"nodes": {"abc123": {"name": "node"}}}
+        obj.client.cluster.state.return_value = {"master_node": "abc123"}
+        obj._find_master()
+        assert obj.is_master
+        obj.client.cluster.state.return_value = {"master_node": "def456"}
+        obj._find_master()
+        assert not obj.is_master
+
+    def test_filtered_responses(self):
+        """Ensure only the needed fields are requested"""
+        obj = Builder(configdict=DEFAULT)
+        obj.client = Mock()
+        obj.client.nodes.info.return_value = {"nodes": {"abc123": {"name": "node"}}}
+        obj.client.cluster.state.return_value = {"master_node": "abc123"}
+        obj._find_master()
+        assert "filter_path" in obj.client.nodes.info.call_args.kwargs
+        assert "filter_path" in obj.client.cluster.state.call_args.kwargs
+
+    def test_no_pool_of_its_own(self):
+        """Ensure no thread pool is started, and the given executor is reused"""
+        obj = Builder(configdict=DEFAULT)
+        obj.client = Mock()
+        obj.client.nodes.info.return_value = {"nodes": {"abc123": {"name": "node"}}}
+        obj.client.cluster.state.return_value = {"master_node": "abc123"}
+        executor = Mock()
+        executor.submit.return_value.result.return_value = {"nodes": {"abc123": {}}}
+        with patch("es_client.builder.ThreadPoolExecutor") as pool:
+            obj._find_master()
+            assert obj.is_master
+            obj._find_master(executor)
+        pool.assert_not_called()
+        assert obj.is_master
+        executor.submit.assert_called_once()
+        obj.client.nodes.info.assert_called_once()
+
+
+class TestCheckVersion(TestCase):
+    """Test _check_version with a mocked client"""
+
+    def test_skip_version_test(self):
+        """Ensure the cluster is not queried when skip_version_test is set"""
+        obj = Builder(configdict=DEFAULT)
+        obj.client = Mock()
+        obj.skip_version_test = True
+        obj._check_version()
+        obj.client.info.assert_not_called()
+
+    def test_info_fetched_once(self):
+        """Ensure the version check and test_connection share one info() call"""
+        obj = Builder(configdict=DEFAULT)
+        obj.client = Mock()
+        obj.client.info.return_value = {"version": {"number": "8.12.0"}}
+        obj._check_version()
+        assert obj.test_connection() == {"version": {"number": "8.12.0"}}
+        obj.client.info.assert_called_once()
+
+    def test_stale_info_refetched(self):
+        """Ensure test_connection goes back to the cluster once the cache is stale"""
+        obj = Builder(configdict=DEFAULT)
+        obj.client = Mock()
+        obj.client.info.return_value = {"version": {"number": "8.12.0"}}
+        obj._check_version()
+        obj._info_time -= 2
+        obj.test_connection()
+        assert obj.client.info.call_count == 2
+
+
+class TestConnect(TestCase):
+    """Test connect with a mocked client"""
+
+    def test_lookups_done_once(self):
+        """Ensure the prefetched info() and master lookups are reused by the checks"""
+        obj = Builder(configdict=DEFAULT)
+        client = Mock()
+        client.info.return_value = {"version": {"number": "8.12.0"}}
+        client.nodes.info.return_value = {"nodes": {"abc123": {"name": "node"}}}
+        client.cluster.state.return_value = {"master_node": "abc123"}
+        with patch.object(Builder, "_get_client"):
+            obj.client = client
+            obj.connect()
+        assert obj.check_is_master()
+        client.info.assert_called_once()
+        client.nodes.info.assert_called_once()
+        client.cluster.state.assert_called_once()
+
+    def test_no_master_lookup_unless_asked(self):
+        """Ensure the master is only looked up for master_only, or when checked"""
+        obj = Builder(configdict=DEFAULT)
+        client = Mock()
+        client.info.return_value = {"version": {"number": "8.12.0"}}
+        client.nodes.info.return_value = {"nodes": {"abc123": {"name": "node"}}}
+        client.cluster.state.return_value = {"master_node": "def456"}
+        with patch.object(Builder, "_get_client"):
+            obj.client = client
+            obj.connect()
+        client.nodes.info.assert_not_called()
+        assert obj.is_master is None
+        assert obj.check_is_master() is False
+        client.nodes.info.assert_called_once()
+
+    def test_master_only_lookups_overlap(self):
+        """Ensure info() and the master lookups all run when master_only is set"""
+        obj = Builder(configdict=DEFAULT)
+        obj.master_only = True
+        client = Mock()
+        client.info.return_value = {"version": {"number": "8.12.0"}}
+        client.nodes.info.return_value = {"nodes": {"abc123": {"name": "node"}}}
+        client.cluster.state.return_value = {"master_node": "abc123"}
+        with patch.object(Builder, "_get_client"):
+            obj.client = client
+            obj.connect()
+        assert obj.is_master
+        client.info.assert_called_once()
+        client.nodes.info.assert_called_once()
+        client.cluster.state.assert_called_once()
+
+    def test_master_only_many_hosts_no_requests(self):
+        """Ensure master_only with many hosts fails before any request is sent"""
+        obj = Builder(configdict=DEFAULT)
+        obj.master_only = True
+        obj.client_args.hosts = ["http://127.0.0.1:9200", "http://127.0.0.2:9200"]
+        obj.client = Mock()
+        with patch.object(Builder, "_get_client"):
+            with pytest.raises(ConfigurationError):
+                obj.connect()
+        assert not obj.client.method_calls
+
+    def test_no_pool_for_single_lookup(self):
+        """Ensure no thread pool is started unless two lookups run at once"""
+        obj = Builder(configdict=DEFAULT)
+        obj.skip_version_test = True
+        obj.client = Mock()
+        with patch.object(Builder, "_get_client"), patch(
+            "es_client.builder.ThreadPoolExecutor"
+        ) as pool:
+            obj.connect()
+        pool.assert_not_called()
+        obj.client.info.assert_not_called()
+
+    def test_warm_up(self):
+        """Ensure warm_up sends one ping per requested connection"""
+        obj = Builder(configdict=DEFAULT)
+        obj.client = Mock()
+        obj.warm_up(connections=3)
+        assert obj.client.ping.call_count == 3
+
+    def test_warm_up_nothing(self):
+        """Ensure warm_up with no connections is a no-op"""
+        obj = Builder(configdict=DEFAULT)
+        obj.client = Mock()
+        obj.warm_up(connections=0)
+        obj.client.ping.assert_not_called()
+
+
+class TestBuildMany(TestCase):
+    """Test Builder.build_many with a mocked client"""
+
+    def test_build_many(self):
+        """Ensure one connected Builder per config, sharing clients when asked"""
+        client = Mock()
+        client.info.return_value = {"version": {"number": "8.12.0"}}
+        client.nodes.info.return_value = {"nodes": {"abc123": {"name": "node"}}}
+        client.cluster.state.return_value = {"master_node": "abc123"}
+        test = {"elasticsearch": {"client": {"hosts": ["http://127.0.0.4:9200"]}}}
+        with patch("elasticsearch8.Elasticsearch", return_value=client) as mock_es:
+            builders = Builder.build_many([test, test], reuse_client=True)
+            Builder.close_cached_clients()
+        assert len(builders) == 2
+        assert builders[0].client is builders[1].client
+        assert all(builder.check_is_master() for builder in builders)
+        mock_es.assert_called_once()
+
+    def test_no_sharing_by_default(self):
+        """Ensure each Builder gets its own client unless reuse_client is set"""
+        client = Mock()
+        client.info.return_value = {"version": {"number": "8.12.0"}}
+        test = {"elasticsearch": {"client": {"hosts": ["http://127.0.0.4:9200"]}}}
+        with patch("elasticsearch8.Elasticsearch", return_value=client) as mock_es:
+            Builder.build_many([test, test])
+        assert mock_es.call_count == 2
+
+
+class TestGetClient(TestCase):
+    """Test the arguments _get_client passes to Elasticsearch"""
+
+    def test_pruned_plain_args(self):
+        """Ensure None values are dropped and nested DotMaps become dicts"""
+        test = {
+            "elasticsearch": {
+                "client": {
+                    "hosts": ["http://127.0.0.1:9200"],
+                    "headers": {"X-Test": "yes"},
+                }
+            }
+        }
+        obj = Builder(configdict=test)
+        with patch("elasticsearch8.Elasticsearch") as mock_es:
+            obj._get_client()
+        kwargs = mock_es.call_args.kwargs
+        assert None not in kwargs.values()
+        assert kwargs["hosts"] == ["http://127.0.0.1:9200"]
+        assert type(kwargs["headers"]) is dict  # pylint: disable=C0123
+
+    def test_reuse_client(self):
+        """Ensure reuse_client shares one client between identical configurations"""
+        with patch("elasticsearch8.Elasticsearch") as mock_es:
+            mock_es.side_effect = lambda **kwargs: Mock()
+            first = Builder(configdict=DEFAULT, reuse_client=True)
+            second = Builder(configdict=DEFAULT, reuse_client=True)
+            third = Builder(configdict=DEFAULT)
+            for obj in (first, second, third):
+                obj._get_client()
+            assert first.client is second.client
+            assert third.client is not first.client
+            shared = first.client
+            Builder.close_cached_clients()
+        shared.close.assert_called_once()
+
+
 class TestCheckSSL(TestCase):
     """Ensure that certifi certificates are picked up"""
 
@@ -212,6 +526,13 @@ class TestCheckSSL(TestCase):
         obj._check_ssl()
         assert certifi.where() == obj.client_args.ca_certs
 
+    def test_certifi_cached(self):
+        """Ensure certifi.where() is only consulted once per process"""
+        first = _certifi_where()
+        hits = _certifi_where.cache_info().hits
+        assert _certifi_where() == first
+        assert _certifi_where.cache_info().hits == hits + 1
+
     def test_ca_certs_named_but_no_file(self):
         """
         Ensure that a ConfigurationError is raised if ca_certs is named but no file
@@ -1,10 +1,17 @@
 """Test functions in es_client.defaults"""
 
 from unittest import TestCase
+import pytest
 from es_client.defaults import (
     CLIENT_SETTINGS,
     OTHER_SETTINGS,
+    OVERRIDE,
+    SHOW_ENVVAR,
+    SHOW_OPTION,
     client_settings,
+    config_logging,
+    config_schema,
+    config_settings,
     other_settings,
 )
 
@@ -21,3 +28,29 @@ class TestSettings(TestCase):
     def test_other_settings(self):
         """Ensure matching output"""
         assert OTHER_SETTINGS == other_settings()
+
+    def test_config_settings(self):
+        """Ensure api_key is excluded and the cached result is reused"""
+        assert "api_key" not in config_settings()
+        assert config_settings() is config_settings()
+
+    def test_settings_are_immutable(self):
+        """Ensure the shared setting name sequences cannot be mutated by callers"""
+        assert isinstance(client_settings(), tuple)
+        assert isinstance(other_settings(), tuple)
+
+    def test_show_overrides_are_read_only(self):
+        """Ensure the shared Click overrides cannot be changed, but still merge"""
+        with pytest.raises(TypeError):
+            SHOW_OPTION["hidden"] = True  # type: ignore
+        with pytest.raises(TypeError):
+            SHOW_ENVVAR["show_envvar"] = False  # type: ignore
+        assert OVERRIDE == {"hidden": False, "show_envvar": True}
+
+    def test_config_schema_cached(self):
+        """Ensure the client configuration Schema is only built once"""
+        assert config_schema() is config_schema()
+
+    def test_config_logging_cached(self):
+        """Ensure the logging configuration Schema is only built once"""
+        assert config_logging() is config_logging()
@@ -2,10 +2,11 @@
 
 import ast
 from unittest import TestCase
+from unittest.mock import patch
 import pytest
 import click
 from click.testing import CliRunner
-from es_client.defaults import CLICK_SETTINGS, ES_DEFAULT
+from es_client.defaults import CLICK_SETTINGS, ES_DEFAULT, SHOW_OPTION
 from es_client.exceptions import ConfigurationError
 from es_client.helpers import config as cfgfn
 from es_client.helpers.utils import option_wrapper
@@ -55,6 +56,12 @@ class TestOverrideSettings(TestCase):
         with pytest.raises(ConfigurationError):
             cfgfn.override_settings(self.orig, 'non-dict')
 
+    def test_settings_not_modified(self):
+        """Ensure the settings passed in are left as they were"""
+        orig = {self.key: '1'}
+        cfgfn.override_settings(orig, {self.key: '2', 'other': '3'})
+        assert orig == {self.key: '1'}
+
 
 class TestCliOpts(TestCase):
     """Test cli_opts function"""
@@ -108,6 +115,32 @@ class TestCliOpts(TestCase):
         with pytest.raises(ConfigurationError):
             cfgfn.cli_opts(self.argname, settings=self.settings, onoff={'foo': 'bar'})
 
+    def test_override_leaves_settings(self):
+        """Ensure an override does not leak into settings or other results"""
+        settings = {self.argname: {self.key: self.src}}
+        plain = cfgfn.cli_opts(self.argname, settings=settings)
+        cfgfn.cli_opts(self.argname, settings=settings, override=self.override)
+        assert settings[self.argname] == {self.key: self.src}
+        assert plain[1] == {self.key: self.src}
+
+    def test_read_only_override(self):
+        """Ensure a read-only mapping such as SHOW_OPTION works as an override"""
+        assert cfgfn.cli_opts('hosts', override=SHOW_OPTION)[1]['hidden'] is False
+
+    def test_repeat_call_not_shared(self):
+        """Ensure repeat calls do not share the returned option settings"""
+        first = cfgfn.cli_opts(self.argname, settings=self.settings, onoff=self.onoff)
+        first[1][self.key] = self.ovr
+        second = cfgfn.cli_opts(self.argname, settings=self.settings, onoff=self.onoff)
+        assert second[1][self.key] == self.src
+
+    def test_settings_changed_in_place(self):
+        """Ensure a change to the settings dict is reflected in the next call"""
+        settings = {self.argname: {'help': 'before'}}
+        assert cfgfn.cli_opts(self.argname, settings=settings)[1]['help'] == 'before'
+        settings[self.argname]['help'] = 'after'
+        assert cfgfn.cli_opts(self.argname, settings=settings)[1]['help'] == 'after'
+
 
 class TestCloudIdOverride(TestCase):
     """Test cloud_id_override functionality"""
@@ -149,6 +182,38 @@ class TestContextSettings(TestCase):
         assert value == retval[key]
 
 
+class TestLazyGroup(TestCase):
+    """Test LazyGroup functionality"""
+
+    def test_help_uses_short_help(self):
+        """Ensure --help lists a lazy command by its short_help without loading it"""
+        group = cfgfn.LazyGroup(
+            'grp', lazy_subcommands={'cmd': ('no.such.module', 'cmd', 'Lazy help')}
+        )
+        result = CliRunner().invoke(group, ['--help'])
+        assert result.exit_code == 0
+        assert 'Lazy help' in result.output
+        assert not group._loaded  # pylint: disable=protected-access
+
+    def test_runs_command_with_short_help(self):
+        """Ensure a lazy command listed by its short_help still runs and has --help"""
+        group = cfgfn.LazyGroup(
+            'grp', lazy_subcommands={'cmd': (__name__, 'lazy_command', 'Lazy help')}
+        )
+        result = CliRunner().invoke(group, ['cmd', '--name', 'lazy'])
+        assert result.exit_code == 0
+        assert result.output == 'hello lazy\n'
+        result = CliRunner().invoke(group, ['cmd', '--help'])
+        assert '--name' in result.output
+
+
+@click.command()
+@click.option('--name')
+def lazy_command(name):
+    """Loaded by TestLazyGroup"""
+    click.echo(f'hello {name}')
+
+
 class TestOverrideClientArgs(TestCase):
     """Test override_client_args functionality, indirectly"""
 
@@ -166,6 +231,17 @@ class TestOverrideClientArgs(TestCase):
         )
 
 
+class TestGetClient(TestCase):
+    """Test get_client functionality"""
+
+    def test_reuse_client_passed_on(self):
+        """Ensure reuse_client reaches the Builder and its client is returned"""
+        with patch.object(cfgfn, "Builder") as builder:
+            client = cfgfn.get_client(configdict=ES_DEFAULT, reuse_client=True)
+        assert builder.call_args.kwargs["reuse_client"] is True
+        assert client is builder.return_value.client
+
+
 class TestGetConfig(TestCase):
     """Test get_config functionality"""
 
@@ -1,9 +1,20 @@
 """Test helpers.logging"""
 
+import json
+import logging
 from unittest import TestCase
 import pytest
 import click
-from es_client.helpers.logging import check_logging_config, get_numeric_loglevel
+from es_client.helpers.logging import (
+    Blacklist,
+    JSONFormatter,
+    Whitelist,
+    check_logging_config,
+    de_dot,
+    get_formatter,
+    get_numeric_loglevel,
+    set_logging,
+)
 from es_client.helpers.utils import get_yaml
 from . import FileTestObj
 
@@ -64,3 +75,129 @@ class TestGetNumericLogLevel(TestCase):
         """Ensure it raises an exception when an invalid loglevel is provided"""
         with pytest.raises(ValueError):
             get_numeric_loglevel("NONSENSE")
+
+    def test_names(self):
+        """Ensure names map as the logging module's own attributes do"""
+        for name in ("debug", "INFO", "Warn", "WARNING", "error", "FATAL", "CRITICAL"):
+            assert get_numeric_loglevel(name) == getattr(logging, name.upper())
+
+
+class TestJSONFormatter(TestCase):
+    """Test JSONFormatter functionality"""
+
+    def make_record(self):
+        """Return a simple LogRecord"""
+        return logging.LogRecord(
+            "es_client.test", logging.INFO, "x.py", 7, "a %s", ("b",), None
+        )
+
+    def test_format(self):
+        """Ensure the wanted attributes are carried over"""
+        result = json.loads(JSONFormatter().format(self.make_record()))
+        assert result["loglevel"] == "INFO"
+        assert result["linenum"] == 7
+        assert result["message"] == "a b"
+        assert result["name"] == "es_client.test"
+        assert result["@timestamp"].endswith("Z")
+
+    def test_dotted_key(self):
+        """Ensure dotted output keys are nested, and message is still present"""
+
+        class DottedFormatter(JSONFormatter):
+            """Map message to a dotted key, as ecs does"""
+
+            WANTED_ATTRS = {"message": "log.original", "levelname": "log.level"}
+
+        result = json.loads(DottedFormatter().format(self.make_record()))
+        assert result["log"] == {"original": "a b", "level": "INFO"}
+        assert result["message"] == "a b"
+
+    def test_default_output_unchanged(self):
+        """Ensure the default output is json.dumps with sorted keys, orjson or not"""
+        output = JSONFormatter().format(self.make_record())
+        assert output == json.dumps(json.loads(output), sort_keys=True)
+
+    def test_orjson_opt_in(self):
+        """Ensure orjson is only used when a subclass opts in"""
+        orjson = pytest.importorskip("orjson")
+
+        class FastFormatter(JSONFormatter):
+            """Opt in to orjson"""
+
+            USE_ORJSON = True
+
+        output = FastFormatter().format(self.make_record())
+        assert output == orjson.dumps(
+            json.loads(output), option=orjson.OPT_SORT_KEYS
+        ).decode("utf-8")
+
+
+class TestDeDot(TestCase):
+    """Test de_dot function"""
+
+    def test_nested(self):
+        """Ensure a dotted string becomes nested keys"""
+        assert de_dot("a.b.c", "msg") == {"a": {"b": {"c": "msg"}}}
+
+
+class TestFilters(TestCase):
+    """Test Whitelist and Blacklist functionality"""
+
+    def record(self, name):
+        """Return a LogRecord from logger `name`"""
+        return logging.LogRecord(name, logging.INFO, "x.py", 1, "msg", None, None)
+
+    def test_whitelist_attribute(self):
+        """Ensure the whitelist attribute still lists a Filter for each name"""
+        names = ["es_client.builder", "elasticsearch8"]
+        assert [f.name for f in Whitelist(*names).whitelist] == names
+
+    def test_whitelist_matches_like_logging_filter(self):
+        """Ensure names and their children match, but not lookalike prefixes"""
+        names = ("es_client.builder", "urllib3")
+        wl = Whitelist(*names)
+        for logger in ("es_client.builder", "urllib3.connectionpool", "urllib", "es"):
+            expected = any(logging.Filter(n).filter(self.record(logger)) for n in names)
+            assert bool(wl.filter(self.record(logger))) == expected
+
+    def test_blacklist(self):
+        """Ensure Blacklist inverts Whitelist"""
+        bl = Blacklist("elastic_transport", "urllib3")
+        assert not bl.filter(self.record("elastic_transport.transport"))
+        assert bl.filter(self.record("es_client.builder"))
+
+
+class TestGetFormatter(TestCase):
+    """Test get_formatter function"""
+
+    def test_shared(self):
+        """Ensure the same formatter is handed out for the same settings"""
+        assert get_formatter("json", False) is get_formatter("json", False)
+        assert isinstance(get_formatter("json", False), JSONFormatter)
+
+    def test_debug_format(self):
+        """Ensure DEBUG gets the more detailed default format"""
+        # pylint: disable=protected-access
+        assert "funcName" in get_formatter("default", True)._fmt
+        assert "funcName" not in get_formatter("default", False)._fmt
+
+
+class TestSetLogging(TestCase):
+    """Test set_logging functionality"""
+
+    def test_repeat_call_replaces_handler(self):
+        """Ensure a second call does not stack another handler or filter"""
+        before = list(logging.root.handlers)
+        level = logging.root.level
+        opts = {"loglevel": "INFO", "logfile": None, "logformat": "default"}
+        try:
+            set_logging({**opts, "blacklist": ["urllib3"]})
+            set_logging({**opts, "blacklist": ["urllib3"]})
+            added = [h for h in logging.root.handlers if h not in before]
+            assert len(added) == 1
+            assert len(added[0].filters) == 1
+        finally:
+            for hdlr in logging.root.handlers:
+                if hdlr not in before:
+                    logging.root.removeHandler(hdlr)
+            logging.root.setLevel(level)
@@ -108,6 +108,17 @@ class TestReadCerts:
         except Exception:
             pytest.fail("Unexpected Exception...")
 
+    def test_unreadable_client_key(self):
+        """Ensure an unreadable client_key raises even when ca_certs is fine"""
+        obj = FileTestObj()
+        config = {
+            "ca_certs": obj.args["filename"],
+            "client_key": obj.args["no_file_here"],
+        }
+        with pytest.raises(ConfigurationError):
+            u.verify_ssl_paths(config)
+        obj.teardown()
+
 
 class TestEnvVars:
     """Test the ability to read environment variables"""
@@ -162,6 +173,46 @@ class TestEnvVars:
             u.get_yaml(obj.args["configfile"])
         obj.teardown()
 
+    def test_python_tuple_tag(self):
+        """Ensure a !!python/tuple tagged value is loaded as a tuple"""
+        obj = FileTestObj()
+        obj.write_config(
+            obj.args["configfile"],
+            YAML.format("http://127.0.0.1:9200")
+            + "\n    retry_on_status: !!python/tuple [429, 503]\n",
+        )
+        cfg = u.get_yaml(obj.args["configfile"])
+        assert cfg["elasticsearch"]["client"]["retry_on_status"] == (429, 503)
+        obj.teardown()
+
+    def test_unknown_tag_raises(self):
+        """Ensure any YAML error, such as an unknown tag, is a ConfigurationError"""
+        obj = FileTestObj()
+        obj.write_config(obj.args["configfile"], "---\nkey: !nosuchtag value\n")
+        with pytest.raises(ConfigurationError):
+            u.get_yaml(obj.args["configfile"])
+        obj.teardown()
+
+    def test_cached_copy(self):
+        """Ensure a repeat read is served from cache as an independent copy"""
+        obj = FileTestObj()
+        obj.write_config(obj.args["configfile"], YAML.format("http://127.0.0.1:9200"))
+        first = u.get_yaml(obj.args["configfile"])
+        first["elasticsearch"]["client"]["hosts"] = "modified"
+        second = u.get_yaml(obj.args["configfile"])
+        assert second["elasticsearch"]["client"]["hosts"] == "http://127.0.0.1:9200"
+        obj.teardown()
+
+    def test_changed_file_reread(self):
+        """Ensure a rewritten file is parsed again"""
+        obj = FileTestObj()
+        obj.write_config(obj.args["configfile"], YAML.format("http://127.0.0.1:9200"))
+        u.get_yaml(obj.args["configfile"])
+        obj.write_config(obj.args["configfile"], YAML.format("http://localhost:9201"))
+        cfg = u.get_yaml(obj.args["configfile"])
+        assert cfg["elasticsearch"]["client"]["hosts"] == "http://localhost:9201"
+        obj.teardown()
+
 
 class TestVerifyURLSchema:
     """Test the u.verify_url_schema function"""
@@ -238,6 +289,23 @@ class TestGetVersion:
         assert version == (9, 9, 9)
 
 
+class TestParseVersion:
+    """Test the u.parse_version function"""
+
+    def test_release(self):
+        """Ensure a plain release version is parsed"""
+        assert u.parse_version("8.12.0") == (8, 12, 0)
+
+    def test_snapshot(self):
+        """Ensure a -SNAPSHOT tag is dropped"""
+        assert u.parse_version("8.12.0-SNAPSHOT") == (8, 12, 0)
+
+    def test_unparseable(self):
+        """Ensure a version without three numeric fields raises ValueError"""
+        with pytest.raises(ValueError):
+            u.parse_version("eight")
+
+
 class TestFileExists:
     """Test the u.file_exists function"""
 